@@ -0,0 +1,215 @@
+"""
+Speech recognition backends behind AudioProcessor: Whisper, and a stub for offline runs
+"""
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+# Sample rate every backend receives audio at (16 kHz mono float32)
+SAMPLE_RATE = 16000
+
+
+class ASRBackend(ABC):
+    """
+    Interface AudioProcessor uses to run speech recognition
+
+    Implementations load their model in load(), not in __init__, so
+    creating one is cheap and transcripts served from a cache never load it.
+    A subclass that does not implement transcribe() and capabilities()
+    cannot be instantiated.
+    """
+
+    name = ""
+
+    def __init__(self, model_name: str = "base", threads: int = None, quantize: str = None):
+        """
+        Args:
+            model_name: Model size or name, as understood by the backend
+            threads: CPU threads for inference (optional, backend default if None)
+            quantize: Weight quantization mode from QUANTIZE_MODES (optional)
+        """
+        self.model_name = model_name
+        self.threads = threads
+        self.quantize = quantize
+        self.loaded = False
+
+    def load(self):
+        """Load the model; called once, before the first transcribe"""
+        self.loaded = True
+
+    def reset(self):
+        """Forget what earlier recordings left behind; called before each recording"""
+
+    @abstractmethod
+    def transcribe(self, audio, offset: float = 0.0, **options) -> Dict:
+        """
+        Transcribe 16 kHz mono float32 samples
+
+        Args:
+            audio: Samples at SAMPLE_RATE
+            offset: Where audio starts in the recording, in seconds; segment
+                times stay relative to audio
+            options: Decoding options (see DECODE_PROFILES) and initial_prompt;
+                backends ignore the ones they do not support
+
+        Returns:
+            Dictionary with "text", "language" and "segments", each segment a
+            dictionary with "start" and "end" in seconds from the start of
+            audio and "text", plus "avg_logprob" and "no_speech_prob" when the
+            backend reports confidence
+        """
+
+    @abstractmethod
+    def capabilities(self) -> Dict:
+        """
+        What this backend supports
+
+        Returns:
+            Dictionary with "name", "model", "segment_timestamps",
+            "initial_prompt", "confidence" (avg_logprob/no_speech_prob),
+            "languages" ("multilingual" or a list) and "quantize" (modes)
+        """
+
+
+class WhisperBackend(ASRBackend):
+    """openai-whisper running on torch"""
+
+    name = "whisper"
+
+    def load(self):
+        import torch
+        import whisper
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        if self.quantize:
+            from quantization import load_quantized
+            self.model = load_quantized(self.model_name, self.quantize)
+        else:
+            self.model = whisper.load_model(self.model_name)
+        self.loaded = True
+
+    def transcribe(self, audio, offset: float = 0.0, **options) -> Dict:
+        return self.model.transcribe(audio, **options)
+
+    def capabilities(self) -> Dict:
+        from config import QUANTIZE_MODES
+        return {
+            "name": self.name,
+            "model": self.model_name,
+            "segment_timestamps": True,
+            "initial_prompt": True,
+            "confidence": True,
+            "languages": "multilingual" if not self.model_name.endswith(".en") else ["en"],
+            "quantize": list(QUANTIZE_MODES)
+        }
+
+
+# Transcript the stub backend repeats; names and phrasing exercise the task extractor
+STUB_TRANSCRIPT = (
+    "Hi everyone, let's discuss this week's priorities. "
+    "Sakshi, we need someone to fix the critical login bug that users reported yesterday. "
+    "This needs to be done by tomorrow evening since it's blocking users. "
+    "Also, the database performance is really slow, Mohit you're good with backend optimization right? "
+    "We should tackle this by end of this week, it's affecting the user experience. "
+    "And we need to update the API documentation before Friday's release - this is high priority. "
+    "Oh, and someone should design the new onboarding screens for the next sprint. "
+    "Arjun, didn't you work on UI designs last month? This can wait until next Monday. "
+    "One more thing - we need to write unit tests for the payment module. "
+    "This depends on the login bug fix being completed first, so let's plan this for Wednesday."
+)
+
+# Speaking rate the stub's transcript is laid out at
+STUB_WORDS_PER_SECOND = 2.5
+
+# Seconds the stub spends per second of audio, roughly Whisper base on a laptop CPU
+STUB_SECONDS_PER_AUDIO_SECOND = 0.05
+
+
+class StubBackend(ASRBackend):
+    """
+    Deterministic stand-in that needs no model weights, torch or network
+
+    Returns the sentences of a canned transcript, repeated as needed and
+    timed at a normal speaking rate across the audio, after sleeping for as
+    long as a real model would take. Use it to benchmark and test main.py and
+    the batch tooling offline.
+
+    Audio that starts where an earlier segment of the same recording
+    started (as when AudioProcessor.iter_segments carries a cut-off segment
+    into the next window) gets that segment's sentence again, like a real
+    model would. Each recording starts from the first sentence.
+    """
+
+    name = "stub"
+
+    def __init__(self, model_name: str = "base", threads: int = None, quantize: str = None,
+                 transcript: str = STUB_TRANSCRIPT, seconds_per_audio_second: float = STUB_SECONDS_PER_AUDIO_SECOND):
+        super().__init__(model_name, threads, quantize)
+        self.sentences: List[str] = [s for s in re.split(r"(?<=[.!?])\s+", transcript.strip()) if s]
+        self.seconds_per_audio_second = seconds_per_audio_second
+        self.reset()
+
+    def reset(self):
+        self._next = 0
+        # sample offset in the recording -> index of the sentence a segment there got
+        self._segment_starts: Dict[int, int] = {}
+
+    def transcribe(self, audio, offset: float = 0.0, **options) -> Dict:
+        duration = len(audio) / SAMPLE_RATE
+        time.sleep(duration * self.seconds_per_audio_second)
+
+        segments = []
+        start = 0.0
+        index = self._segment_starts.get(round(offset * SAMPLE_RATE), self._next)
+        while self.sentences:
+            sentence = self.sentences[index % len(self.sentences)]
+            end = start + len(sentence.split()) / STUB_WORDS_PER_SECOND
+            if end > duration:
+                break
+            self._segment_starts[round((offset + start) * SAMPLE_RATE)] = index
+            segments.append({
+                "start": start, "end": end, "text": " " + sentence,
+                "avg_logprob": -0.2, "no_speech_prob": 0.01
+            })
+            index += 1
+            start = end
+        self._next = index
+
+        return {"text": "".join(segment["text"] for segment in segments), "segments": segments, "language": "en"}
+
+    def capabilities(self) -> Dict:
+        return {
+            "name": self.name,
+            "model": self.model_name,
+            "segment_timestamps": True,
+            "initial_prompt": False,
+            "confidence": True,
+            "languages": ["en"],
+            "quantize": []
+        }
+
+
+BACKENDS = {backend.name: backend for backend in (WhisperBackend, StubBackend)}
+
+
+def create_backend(name: str, model_name: str = "base", threads: int = None, quantize: str = None) -> ASRBackend:
+    """
+    Create (but not load) a backend by name
+
+    Args:
+        name: Key of BACKENDS ("whisper" or "stub")
+        model_name: Model size or name for the backend
+        threads: CPU threads for inference (optional)
+        quantize: Weight quantization mode (optional)
+
+    Returns:
+        ASRBackend instance
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown ASR backend: {name}")
+    backend = BACKENDS[name](model_name=model_name, threads=threads, quantize=quantize)
+    if quantize and quantize not in backend.capabilities()["quantize"]:
+        raise ValueError(f"The {name} backend does not support --quantize {quantize}")
+    return backend
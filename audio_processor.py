@@ -1,51 +1,201 @@
 """
-Audio preprocessing and Speech-to-Text conversion module
+Audio decoding and Speech-to-Text conversion module
 """
-import whisper
+import numpy as np
 import os
-from pydub import AudioSegment
+import subprocess
+from vad import trim_silence
+from asr_backends import SAMPLE_RATE, create_backend
+from config import DECODE_PROFILES, DEFAULT_PROFILE
+import metrics
+
+
+# Options passed to model.transcribe under every profile; part of the transcript cache key
+DECODE_OPTIONS = {"fp16": False}
+
+# Audio decoded and transcribed at a time by iter_segments
+WINDOW_SECONDS = 30
+
+# Characters of already transcribed text passed as the prompt for the next window
+PROMPT_CHARS = 200
+
+
+def decode_options(profile):
+    """Options passed to model.transcribe for a named profile in DECODE_PROFILES"""
+    if profile not in DECODE_PROFILES:
+        raise ValueError(f"Unknown decoding profile: {profile}")
+    return dict(DECODE_OPTIONS, **DECODE_PROFILES[profile])
+
+
+def _ffmpeg_command(audio_path):
+    """ffmpeg command writing 16 kHz mono signed 16-bit PCM to stdout"""
+    return [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0",
+        "-i", audio_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+        "-"
+    ]
+
+
+def decode_audio(audio_path):
+    """
+    Decode a whole recording with a single ffmpeg run, entirely in memory
+    
+    Nothing is written to disk, so read-only input directories work, and the
+    result goes straight to model.transcribe without Whisper decoding again.
+    
+    Args:
+        audio_path: Path to audio file (any format ffmpeg can read)
+        
+    Returns:
+        16 kHz mono float32 NumPy array
+    """
+    if not os.path.exists(audio_path):
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    
+    process = subprocess.run(_ffmpeg_command(audio_path), capture_output=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {process.stderr.decode(errors='replace').strip()}")
+    
+    audio = np.frombuffer(process.stdout, np.int16).astype(np.float32)
+    audio /= 32768.0
+    return audio
+
+
+def stream_pcm(audio_path, window_samples):
+    """
+    Decode audio with ffmpeg and yield it in fixed-size windows
+    
+    Only one window is held in memory at a time, however long the recording.
+    
+    Args:
+        audio_path: Path to audio file (any format ffmpeg can read)
+        window_samples: Samples per window
+        
+    Yields:
+        16 kHz mono float32 arrays of window_samples samples; the last may be shorter
+    """
+    process = subprocess.Popen(_ffmpeg_command(audio_path), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = process.stdout.read(window_samples * 2)
+            if not data:
+                break
+            yield np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+    finally:
+        process.stdout.close()
+        # Errors are a few lines at most, so reading stderr last cannot block ffmpeg
+        error = process.stderr.read().decode(errors="replace")
+        process.stderr.close()
+        if process.wait() != 0 and error:
+            raise RuntimeError(f"Failed to decode audio: {error.strip()}")
 
 
 class AudioProcessor:
-    def __init__(self, model_name="base"):
+    def __init__(self, model_name="base", threads=None, cache=None, pcm_cache=None, vad=True,
+                 profile=DEFAULT_PROFILE, quantize=None, backend="whisper"):
         """
-        Initialize the audio processor with Whisper model
+        Initialize the audio processor with a speech recognition backend
+        
+        The model is loaded on first use, so transcripts served from the
+        cache never pay for loading it.
         
         Args:
             model_name: Whisper model size (tiny, base, small, medium, large)
+            threads: Number of CPU threads for inference (optional, backend default if None)
+            cache: TranscriptCache for finished transcripts (optional)
+            pcm_cache: PCMCache for decoded audio, reused across model sizes (optional)
+            vad: Cut silence out before inference and transcribe only speech
+            profile: Decoding profile name from DECODE_PROFILES (fast, balanced, accurate)
+            quantize: Weight quantization mode from QUANTIZE_MODES, e.g. "int8" (optional)
+            backend: ASR backend name from BACKENDS ("whisper", or "stub" for offline runs)
         """
-        print(f"Loading Whisper model: {model_name}...")
-        self.model = whisper.load_model(model_name)
-        print("Model loaded successfully!")
+        self.backend = create_backend(backend, model_name=model_name, threads=threads, quantize=quantize)
+        self.model_name = model_name
+        self.profile = profile
+        self.cache = cache
+        self.pcm_cache = pcm_cache
+        self.vad = vad
+        self.quantize = quantize
+    
+    @property
+    def profile(self):
+        """Name of the decoding profile; setting it replaces decode_options"""
+        return self._profile
+    
+    @profile.setter
+    def profile(self, profile):
+        self.decode_options = decode_options(profile)
+        self._profile = profile
     
-    def preprocess_audio(self, audio_path):
+    @property
+    def model(self):
+        """The ASR backend, its model loaded on first access"""
+        if not self.backend.loaded:
+            name = "Whisper" if self.backend.name == "whisper" else f"{self.backend.name} backend"
+            quantize = f" ({self.quantize})" if self.quantize else ""
+            print(f"Loading {name} model: {self.model_name}{quantize}...")
+            with metrics.span("model_load", model=self.model_name, backend=self.backend.name):
+                self.backend.load()
+            print("Model loaded successfully!")
+        return self.backend
+    
+    def load_audio(self, audio_path):
         """
-        Preprocess audio file - convert to required format if needed
+        Decode a recording, or map its cached samples without running ffmpeg
         
         Args:
-            audio_path: Path to input audio file
+            audio_path: Path to audio file
             
         Returns:
-            Path to processed audio file
+            16 kHz mono float32 NumPy array (memory-mapped when cached)
         """
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
-        
-        _, ext = os.path.splitext(audio_path.lower())
-        
-        supported_formats = ['.wav', '.mp3', '.m4a', '.flac', '.ogg']
+        with metrics.span("decode") as decode:
+            if self.pcm_cache is None:
+                audio = decode_audio(audio_path)
+            else:
+                key = self.pcm_cache.key(audio_path)
+                audio = self.pcm_cache.get(key)
+                if audio is not None:
+                    print(f"Using cached audio for {os.path.basename(audio_path)}")
+                    decode.labels["cached"] = True
+                else:
+                    audio = decode_audio(audio_path)
+                    self.pcm_cache.put(key, audio)
+            decode.audio_seconds = len(audio) / SAMPLE_RATE
+        return audio
+    
+    def _windows(self, audio_path, window_samples):
+        """Windows of samples from the decoded audio cache, or streamed from ffmpeg while filling it"""
+        if self.pcm_cache is None:
+            yield from stream_pcm(audio_path, window_samples)
+            return
         
-        if ext in supported_formats:
-            return audio_path
+        key = self.pcm_cache.key(audio_path)
+        audio = self.pcm_cache.get(key)
+        if audio is not None:
+            print(f"Using cached audio for {os.path.basename(audio_path)}")
+            for start in range(0, len(audio), window_samples):
+                yield audio[start:start + window_samples]
+            return
         
+        writer = self.pcm_cache.writer(key)
         try:
-            audio = AudioSegment.from_file(audio_path)
-            output_path = audio_path.rsplit('.', 1)[0] + '.wav'
-            audio.export(output_path, format="wav")
-            return output_path
-        except Exception as e:
-            print(f"Warning: Could not convert audio. Trying direct processing: {e}")
-            return audio_path
+            for window in stream_pcm(audio_path, window_samples):
+                writer.write(window)
+                yield window
+        except BaseException:
+            # Includes the consumer stopping early: a partial entry is never stored
+            writer.discard()
+            raise
+        writer.commit()
+    
+    def _next_window(self, windows):
+        """Next window of samples, or None at the end; time spent decoding it counts as decode"""
+        with metrics.span("decode", streaming=True) as decode:
+            window = next(windows, None)
+            decode.audio_seconds = len(window) / SAMPLE_RATE if window is not None else 0.0
+        return window
     
     def transcribe(self, audio_path):
         """
@@ -57,17 +207,205 @@ class AudioProcessor:
         Returns:
             Transcribed text string
         """
-        print(f"Preprocessing audio: {os.path.basename(audio_path)}...")
-        processed_audio = self.preprocess_audio(audio_path)
+        return self.transcribe_file(audio_path)["text"]
+    
+    def transcribe_file(self, audio_path):
+        """
+        Convert audio to text using Whisper, keeping segment timing
+        
+        Args:
+            audio_path: Path to audio file
+            
+        Returns:
+            Dictionary with the transcript "text", Whisper "segments",
+            detected "language" and audio "duration" in seconds
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(audio_path, self.model_name, self.cache_options())
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"Using cached transcript for {os.path.basename(audio_path)}")
+                return cached
         
-        file_size = os.path.getsize(processed_audio)
-        print(f"Processing file: {os.path.basename(processed_audio)} ({file_size:,} bytes)")
+        print(f"Decoding audio: {os.path.basename(audio_path)}...")
+        audio = self.load_audio(audio_path)
+        print(f"Decoded {len(audio) / SAMPLE_RATE:.1f} seconds of audio")
         
         print("Transcribing audio to text...")
-        result = self.model.transcribe(processed_audio, fp16=False)
+        result = self.transcribe_audio(audio)
+        if self.vad:
+            print(f"Skipped {self._skipped_summary(result['skipped_seconds'], result['duration'])}")
+        print(f"Transcription completed. Length: {len(result['text'])} characters")
         
-        transcript = result["text"]
-        print(f"Transcription completed. Length: {len(transcript)} characters")
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
         
-        return transcript
-
+        return result
+    
+    def cache_options(self, **extra):
+        """Settings that change the transcript, for transcript cache keys"""
+        options = dict(self.decode_options, vad=self.vad, **extra)
+        if self.quantize:
+            options["quantize"] = self.quantize
+        if self.backend.name != "whisper":
+            options["backend"] = self.backend.name
+        return options
+    
+    def _skipped_summary(self, skipped_seconds, duration):
+        share = skipped_seconds / duration if duration else 0.0
+        return f"{skipped_seconds:.1f}s of silence ({share:.0%} of the audio)"
+    
+    def _run_model(self, audio, offset=0.0, **options):
+        """
+        Run Whisper on samples, silence trimmed first when VAD is on
+        
+        Args:
+            audio: 16 kHz mono float32 samples
+            offset: Start time of the samples in the recording, in seconds
+            options: Options for model.transcribe besides the profile's
+        
+        Returns:
+            (result, speech_map): the model's result with segment times on the
+            timeline of audio, and the SpeechMap of what was kept (None without VAD)
+        """
+        # Loaded before the inference span opens, so loading is not counted as inference
+        model = self.model
+        if not self.vad:
+            with metrics.span("inference", len(audio) / SAMPLE_RATE, model=self.model_name):
+                return model.transcribe(audio, offset=offset, **self.decode_options, **options), None
+        
+        with metrics.span("vad", len(audio) / SAMPLE_RATE):
+            speech, speech_map = trim_silence(audio, SAMPLE_RATE)
+        if len(speech) == 0:
+            return {"text": "", "segments": [], "language": None}, speech_map
+        
+        with metrics.span("inference", len(speech) / SAMPLE_RATE, model=self.model_name):
+            result = model.transcribe(speech, offset=offset, **self.decode_options, **options)
+        if len(speech) < len(audio):
+            for segment in result.get("segments", []):
+                segment["start"] = speech_map.original_time(segment["start"])
+                segment["end"] = speech_map.original_time(segment["end"], end=True)
+        return result, speech_map
+    
+    def iter_segments(self, audio_path, window_seconds=WINDOW_SECONDS):
+        """
+        Transcribe a recording window by window, yielding segments as they are decoded
+        
+        The last segment of each window may be cut off mid-sentence, so its
+        audio is carried over into the next window instead of being yielded.
+        Memory stays bounded by about two windows of audio.
+        
+        Args:
+            audio_path: Path to audio file
+            window_seconds: Seconds of audio decoded and transcribed at a time
+            
+        Yields:
+            Whisper segment dictionaries with "start" and "end" in seconds
+            from the beginning of the recording, and "text"
+        """
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        cache_key = None
+        if self.cache is not None:
+            # Window boundaries change the transcript, so they are part of the key
+            options = self.cache_options(window_seconds=window_seconds)
+            cache_key = self.cache.key(audio_path, self.model_name, options)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"Using cached transcript for {os.path.basename(audio_path)}")
+                yield from cached["segments"]
+                return
+        
+        self.backend.reset()
+        sample_rate = SAMPLE_RATE
+        windows = self._windows(audio_path, window_seconds * sample_rate)
+        carry = np.zeros(0, dtype=np.float32)
+        carry_start = 0.0
+        total_samples = 0
+        skipped_samples = 0
+        prompt = ""
+        prompting = self.backend.capabilities()["initial_prompt"]
+        # Segments are only kept when they are going to be cached
+        segments = []
+        language = None
+        
+        window = self._next_window(windows)
+        while window is not None:
+            following = self._next_window(windows)
+            total_samples += len(window)
+            audio = np.concatenate([carry, window])
+            offset = carry_start
+            
+            if prompting:
+                result, speech_map = self._run_model(audio, offset, initial_prompt=prompt or None)
+            else:
+                result, speech_map = self._run_model(audio, offset)
+            language = language or result.get("language")
+            window_segments = result.get("segments", [])
+            
+            if following is not None and len(window_segments) > 1:
+                cut = window_segments[-1]["start"]
+                carry = audio[int(cut * sample_rate):]
+                carry_start = offset + cut
+                window_segments = window_segments[:-1]
+            else:
+                carry = np.zeros(0, dtype=np.float32)
+                carry_start = offset + len(audio) / sample_rate
+            
+            if speech_map is not None:
+                # Silence in the carried audio is counted when its window is final
+                skipped_samples += speech_map.silence(0, len(audio) - len(carry))
+            
+            for segment in window_segments:
+                segment["start"] += offset
+                segment["end"] += offset
+                prompt = (prompt + segment["text"])[-PROMPT_CHARS:]
+                if cache_key is not None:
+                    segments.append(segment)
+                yield segment
+            
+            window = following
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, {
+                "text": "".join(segment["text"] for segment in segments),
+                "segments": segments,
+                "language": language,
+                "duration": total_samples / sample_rate,
+                "skipped_seconds": skipped_samples / sample_rate
+            })
+        if self.vad:
+            print(f"Skipped {self._skipped_summary(skipped_samples / sample_rate, total_samples / sample_rate)}")
+    
+    def transcribe_audio(self, audio, offset=0.0):
+        """
+        Convert an already decoded waveform to text using Whisper
+        
+        Args:
+            audio: 16 kHz mono float32 samples
+            offset: Start time of the samples in the recording, in seconds;
+                added to segment timestamps
+            
+        Returns:
+            Dictionary with "text", "segments", "language", "duration" and
+            "skipped_seconds" of silence not sent to the model
+        """
+        self.backend.reset()
+        result, speech_map = self._run_model(audio, offset)
+        skipped = speech_map.silence(0, len(audio)) if speech_map is not None else 0
+        
+        segments = result.get("segments", [])
+        if offset:
+            for segment in segments:
+                segment["start"] += offset
+                segment["end"] += offset
+        
+        return {
+            "text": result["text"],
+            "segments": segments,
+            "language": result.get("language"),
+            "duration": len(audio) / SAMPLE_RATE,
+            "skipped_seconds": skipped / SAMPLE_RATE
+        }
@@ -0,0 +1,246 @@
+"""
+Batch processing of many meeting recordings with a single loaded model
+"""
+import os
+import time
+from typing import List, Dict
+from audio_processor import AudioProcessor
+from task_extractor import TaskExtractor
+from output_formatter import OutputFormatter
+from parallel_transcriber import ParallelTranscriber
+from cascade_transcriber import CascadeTranscriber
+from roster import load_roster
+from config import DEFAULT_PROFILE
+
+
+class BatchProcessor:
+    def __init__(self, model_name="base", workers=1, threads=None, cache=None, pcm_cache=None, vad=True,
+                 profile=DEFAULT_PROFILE, cascade=None, quantize=None, backend="whisper", roster=None,
+                 meeting_date=None):
+        """
+        Set up one Whisper model and extractor for the whole batch
+
+        Args:
+            model_name: Whisper model size (tiny, base, small, medium, large)
+            workers: Number of transcription processes; above 1 each worker
+                loads its own model and recordings are spread across them
+            threads: torch CPU threads per transcription process (optional)
+            cache: TranscriptCache for finished transcripts (optional)
+            pcm_cache: PCMCache for decoded audio (optional)
+            vad: Cut silence out before inference, see AudioProcessor
+            profile: Decoding profile name from DECODE_PROFILES
+            cascade: Larger model that re-decodes low-confidence segments (optional,
+                single process only, see CascadeTranscriber)
+            quantize: Weight quantization mode, see AudioProcessor (optional)
+            backend: ASR backend name, see AudioProcessor
+            roster: Roster tasks are assigned to (optional, load_roster() default)
+            meeting_date: Date deadlines are resolved from (optional, see TaskExtractor)
+        """
+        self.roster = roster or load_roster()
+        self.model_name = model_name
+        self.profile = profile
+        self.cascade = cascade
+        self.quantize = quantize
+        self.backend = backend
+        if workers > 1:
+            self.audio_processor = None
+            self.transcriber = ParallelTranscriber(
+                model_name=model_name, workers=workers, threads=threads, cache=cache, pcm_cache=pcm_cache, vad=vad,
+                profile=profile, quantize=quantize, backend=backend
+            )
+        elif cascade:
+            self.audio_processor = CascadeTranscriber(
+                model_name, cascade, threads=threads, cache=cache, pcm_cache=pcm_cache, vad=vad,
+                profile=profile, quantize=quantize, backend=backend, roster=self.roster
+            )
+            self.transcriber = None
+        else:
+            self.audio_processor = AudioProcessor(
+                model_name=model_name, threads=threads, cache=cache, pcm_cache=pcm_cache, vad=vad,
+                profile=profile, quantize=quantize, backend=backend
+            )
+            self.transcriber = None
+        self.task_extractor = TaskExtractor(self.roster, meeting_date)
+        self.formatter = OutputFormatter()
+
+    def use_roster(self, roster):
+        """Assign tasks to, and check cascade drafts against, another Roster"""
+        if roster is self.roster:
+            return
+        self.roster = roster
+        self.task_extractor = TaskExtractor(roster, self.task_extractor.meeting_date)
+        if isinstance(self.audio_processor, CascadeTranscriber):
+            self.audio_processor.use_roster(roster)
+
+    def details(self) -> Dict[str, str]:
+        """Transcription settings recorded in the reports"""
+        model = self.model_name
+        if self.cascade:
+            model = f"{model}, {self.cascade} for low-confidence segments"
+        if self.quantize:
+            model = f"{model} ({self.quantize})"
+        if self.backend != "whisper":
+            model = f"{model} [{self.backend} backend]"
+        return {"Whisper Model": model, "Decoding Profile": self.profile}
+
+    def close(self):
+        """Shut down the transcription workers, if any"""
+        if self.transcriber is not None:
+            self.transcriber.close()
+
+    def transcriptions(self, audio_files: List[str]):
+        """
+        Transcribe recordings in order, in this process or across the workers
+
+        Yields:
+            (audio_file, result, error) tuples, see ParallelTranscriber.map_files
+        """
+        if self.transcriber is not None:
+            yield from self.transcriber.map_files(audio_files)
+            return
+
+        for audio_file in audio_files:
+            start = time.perf_counter()
+            try:
+                result = self.audio_processor.transcribe_file(audio_file)
+            except Exception as e:
+                yield audio_file, None, e
+            else:
+                result["transcribe_seconds"] = time.perf_counter() - start
+                yield audio_file, result, None
+
+    def process_file(self, audio_file: str, transcription: Dict, output_dir: str, name: str = None,
+                     base_name: str = None) -> Dict:
+        """
+        Extract tasks from one transcribed recording and write its CSV and PDF
+
+        Args:
+            audio_file: Path to the recording
+            transcription: Result of AudioProcessor.transcribe_file
+            output_dir: Directory for the per-recording reports
+            name: Name of the recording in the batch reports (optional, its file name)
+            base_name: Start of its report file names (optional, the file name without extension)
+
+        Returns:
+            Result dictionary for the batch summary
+        """
+        start = time.perf_counter()
+        tasks = self.task_extractor.extract_tasks(transcription["text"])
+
+        name = name or os.path.basename(audio_file)
+        base_name = base_name or os.path.splitext(os.path.basename(audio_file))[0]
+        csv_path = os.path.join(output_dir, f"{base_name}_task_assignments.csv")
+        pdf_path = os.path.join(output_dir, f"{base_name}_task_assignments.pdf")
+        self.formatter.save_to_csv(tasks, csv_path)
+        self.formatter.save_to_pdf(tasks, pdf_path, audio_file, self.details())
+
+        return {
+            "recording": audio_file,
+            "name": name,
+            "status": "ok",
+            "tasks": tasks,
+            "audio_seconds": transcription["duration"],
+            "skipped_seconds": transcription.get("skipped_seconds", 0.0),
+            "profile": self.profile,
+            "wall_seconds": transcription["transcribe_seconds"] + time.perf_counter() - start,
+            "error": ""
+        }
+
+    def run(self, audio_files: List[str], output_dir: str = ".") -> List[Dict]:
+        """
+        Process every recording, continuing past failures
+
+        Args:
+            audio_files: Paths of the recordings to process
+            output_dir: Directory for per-recording reports and the combined summary
+
+        Returns:
+            One result dictionary per recording
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        results = []
+        batch_start = time.perf_counter()
+
+        names = recording_names(audio_files)
+        transcriptions = self.transcriptions(audio_files)
+        for number, (audio_file, transcription, error) in enumerate(transcriptions, 1):
+            name, base_name = names[audio_file]
+            print("\n" + "-"*80)
+            print(f"[{number}/{len(audio_files)}] {audio_file}")
+            print("-"*80)
+            try:
+                if error is not None:
+                    raise error
+                result = self.process_file(audio_file, transcription, output_dir, name, base_name)
+            except Exception as e:
+                print(f"\n✗ Failed to process {audio_file}: {e}")
+                result = {
+                    "recording": audio_file,
+                    "name": name,
+                    "status": "failed",
+                    "tasks": [],
+                    "audio_seconds": 0.0,
+                    "skipped_seconds": 0.0,
+                    "profile": self.profile,
+                    "wall_seconds": transcription["transcribe_seconds"] if transcription else 0.0,
+                    "error": str(e)
+                }
+            else:
+                print(f"✓ {len(result['tasks'])} tasks, "
+                      f"{_throughput(result['audio_seconds'], result['wall_seconds'])}")
+            results.append(result)
+
+        total_wall = time.perf_counter() - batch_start
+        self.formatter.save_batch_summary(results, os.path.join(output_dir, "batch_summary.csv"))
+        all_tasks = [
+            dict(task, recording=result["name"])
+            for result in results for task in result["tasks"]
+        ]
+        if all_tasks:
+            self.formatter.save_to_csv(all_tasks, os.path.join(output_dir, "all_task_assignments.csv"))
+
+        succeeded = [result for result in results if result["status"] == "ok"]
+        total_audio = sum(result["audio_seconds"] for result in succeeded)
+        print("\n" + "="*80)
+        print(f"Processed {len(succeeded)}/{len(results)} recordings, {len(all_tasks)} tasks")
+        print(f"Total: {_throughput(total_audio, total_wall)}")
+        print("="*80)
+        return results
+
+
+def recording_names(audio_files: List[str]) -> Dict[str, tuple]:
+    """
+    Names that tell the recordings of a batch apart
+
+    A recording is named by its path relative to the directory all of them
+    are in, so a/meeting.mp3 and b/meeting.mp3 keep their own reports. Report
+    file names replace the path separators with "_"; if two still clash
+    (meeting.mp3 and meeting.wav), the later ones get a _2, _3, ... suffix.
+
+    Args:
+        audio_files: Paths of the recordings
+
+    Returns:
+        Path -> (name for the Recording column, start of its report file names)
+    """
+    paths = [os.path.abspath(audio_file) for audio_file in audio_files]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else ""
+    names = {}
+    used = set()
+    for audio_file, path in zip(audio_files, paths):
+        name = os.path.relpath(path, root).replace(os.sep, "/")
+        base_name = os.path.splitext(name)[0].replace("/", "_")
+        unique = base_name
+        suffix = 2
+        while unique in used:
+            unique = f"{base_name}_{suffix}"
+            suffix += 1
+        used.add(unique)
+        names[audio_file] = (name, unique)
+    return names
+
+
+def _throughput(audio_seconds: float, wall_seconds: float) -> str:
+    """Format audio-seconds per wall-second for progress lines"""
+    rate = audio_seconds / wall_seconds if wall_seconds > 0 else 0.0
+    return f"{audio_seconds:.1f}s audio in {wall_seconds:.1f}s ({rate:.2f} audio-s/s)"
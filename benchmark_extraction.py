@@ -0,0 +1,267 @@
+"""
+Micro-benchmarks for task extraction on synthetic meetings, with baseline regression checks
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from typing import List, Dict
+from config import TEAM_MEMBERS, PRIORITY_KEYWORDS
+from task_extractor import TaskExtractor, DEADLINE_PHRASES
+
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# A size whose throughput or memory is this much worse than the baseline is a regression
+DEFAULT_TOLERANCE = 0.2
+
+# Baseline compared against unless --baseline names another or --no-baseline is given;
+# saved from a default run with --save-baseline benchmark_baseline.json
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Sentence openers that make a task sentence, one per TASK_INDICATORS family
+TASK_VERBS = [
+    "we need to", "need someone to", "should", "must", "have to", "someone should",
+    "is required to", "should tackle", "tackle", "update", "write", "design", "fix", "optimize",
+]
+
+OPENERS = ["", "Hi everyone, ", "Also, ", "And ", "Oh and ", "One more thing, ", "Let's ", "So "]
+
+DEADLINE_TAILS = [
+    " till next monday", " until friday", " by next wednesday", " by 12/05", " by today",
+    " before release", " end of next week",
+] + [f" {phrase}" for phrase, _ in DEADLINE_PHRASES]
+
+DEPENDENCY_TAILS = [
+    " after the login bug fix", " once task 2 is done", " depends on the login fix", " following the review",
+]
+
+# How ASR tends to spell the config.py names, found by the roster's phonetic index
+MISHEARD_NAMES = ["saksh", "sakshy", "moheet", "mohith", "arjunn", "arjuan", "latha"]
+
+# Sentences without a task, some of them context for the task sentence before them
+FILLER = [
+    "Ok.", "Good.", "I understand.", "Let's move on.", "Any questions so far?",
+    "It depends on the login bug fix being completed first.", "By Friday please.", "Since users complain.",
+]
+
+
+def generate_meeting(sentences: int, seed: int = 0) -> str:
+    """
+    Build a synthetic meeting transcript
+
+    Task sentences combine the config.py roster (names, misheard names and skills), task verbs, deadline phrases, priority keywords and dependencies;
+    the rest are filler and follow-up sentences.
+
+    Args:
+        sentences: Number of sentences
+        seed: Random seed; the same seed gives the same transcript
+
+    Returns:
+        Transcript text
+    """
+    rng = random.Random(seed)
+    names = [member["name"] for member in TEAM_MEMBERS]
+    names += [alias for member in TEAM_MEMBERS for alias in member.get("aliases", [])] + MISHEARD_NAMES
+    skills = [skill for member in TEAM_MEMBERS for skill in member["skills"]]
+    priorities = [keyword for keywords in PRIORITY_KEYWORDS.values() for keyword in keywords]
+    tails = [
+        DEADLINE_TAILS,
+        [f", this is {keyword}" for keyword in priorities],
+        DEPENDENCY_TAILS,
+        [""],
+    ]
+
+    parts = []
+    for _ in range(sentences):
+        if rng.random() < 0.6:
+            name = rng.choice(names) + ", " if rng.random() < 0.5 else ""
+            sentence = (rng.choice(OPENERS) + name + rng.choice(TASK_VERBS)
+                        + f" the {rng.choice(skills)} work" + rng.choice(rng.choice(tails)) + ".")
+        else:
+            sentence = rng.choice(FILLER)
+        parts.append(sentence)
+        parts.append(rng.choice([" ", " ", "\n"]))
+    return "".join(parts)
+
+
+def _helper_names() -> List[str]:
+    return sorted(name for name in dir(TaskExtractor) if name.startswith("_extract_"))
+
+
+def _instrument(extractor: TaskExtractor, timings: Dict[str, Dict]):
+    """Wrap each _extract_* method of one extractor so calls add to timings"""
+    for name in _helper_names():
+        method = getattr(extractor, name)
+        stats = timings.setdefault(name, {"calls": 0, "seconds": 0.0})
+
+        def timed(*args, _method=method, _stats=stats, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                _stats["calls"] += 1
+                _stats["seconds"] += time.perf_counter() - start
+
+        setattr(extractor, name, timed)
+
+
+def benchmark_size(sentences: int, repeat: int = 3, seed: int = 0) -> Dict:
+    """
+    Benchmark extraction of one synthetic meeting
+
+    Whole-extraction time is the best of repeat uninstrumented runs; peak
+    memory and helper timings come from one extra run each, since
+    tracemalloc and the timing wrappers slow extraction down.
+
+    Args:
+        sentences: Meeting length in sentences
+        repeat: Timed runs of the whole extraction
+        seed: Random seed for generate_meeting
+
+    Returns:
+        Dictionary with "sentences", "tasks", "seconds", "sentences_per_sec",
+        "tasks_per_sec", "peak_mb" and "helpers" (calls and cumulative
+        seconds per _extract_* method; _extract_task includes the others)
+    """
+    text = generate_meeting(sentences, seed)
+    extractor = TaskExtractor()
+
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        tasks = extractor.extract_tasks(text)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        extractor.extract_tasks(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    helpers = {}
+    instrumented = TaskExtractor()
+    _instrument(instrumented, helpers)
+    instrumented.extract_tasks(text)
+
+    return {
+        "sentences": sentences,
+        "tasks": len(tasks),
+        "seconds": best,
+        "sentences_per_sec": sentences / best if best > 0 else 0.0,
+        "tasks_per_sec": len(tasks) / best if best > 0 else 0.0,
+        "peak_mb": peak / (1024 * 1024),
+        "helpers": helpers
+    }
+
+
+def run_benchmarks(sizes: List[int], repeat: int = 3, seed: int = 0) -> Dict:
+    """
+    Benchmark every meeting size
+
+    Returns:
+        Dictionary with "seed" and "sizes", the benchmark_size results keyed
+        by size (as a string, so results round-trip through JSON)
+    """
+    return {
+        "seed": seed,
+        "sizes": {str(size): benchmark_size(size, repeat, seed) for size in sizes}
+    }
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Find sizes that got slower or use more memory than in a saved baseline
+
+    Args:
+        results: run_benchmarks output
+        baseline: Earlier run_benchmarks output, loaded from JSON
+        tolerance: Allowed relative slowdown or memory growth
+
+    Returns:
+        One message per regression; empty when there are none
+    """
+    regressions = []
+    if results.get("seed") != baseline.get("seed"):
+        regressions.append(f"Seed {results.get('seed')} differs from the baseline's {baseline.get('seed')}")
+    for size, current in results["sizes"].items():
+        previous = baseline.get("sizes", {}).get(size)
+        if previous is None:
+            continue
+        if current["tasks"] != previous["tasks"]:
+            regressions.append(f"{size} sentences: {current['tasks']} tasks, baseline found {previous['tasks']}")
+        if current["sentences_per_sec"] < previous["sentences_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{size} sentences: {current['sentences_per_sec']:,.0f} sentences/s, "
+                f"baseline {previous['sentences_per_sec']:,.0f}"
+            )
+        if current["peak_mb"] > previous["peak_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{size} sentences: peak {current['peak_mb']:.1f} MB, baseline {previous['peak_mb']:.1f} MB"
+            )
+    return regressions
+
+
+def print_results(results: Dict):
+    """Print throughput, memory and per-helper timings for every size"""
+    print("=" * 80)
+    print(f"{'Sentences':>10} {'Tasks':>8} {'Seconds':>10} {'Sentences/s':>14} {'Tasks/s':>12} {'Peak MB':>9}")
+    print("-" * 80)
+    for size, result in results["sizes"].items():
+        print(f"{size:>10} {result['tasks']:>8} {result['seconds']:>10.4f} "
+              f"{result['sentences_per_sec']:>14,.0f} {result['tasks_per_sec']:>12,.0f} {result['peak_mb']:>9.2f}")
+    print("=" * 80)
+
+    print(f"\n{'Helper':<28} {'Sentences':>10} {'Calls':>8} {'Seconds':>10} {'us/call':>10}")
+    print("-" * 80)
+    for size, result in results["sizes"].items():
+        for name, stats in result["helpers"].items():
+            per_call = stats["seconds"] / stats["calls"] * 1e6 if stats["calls"] else 0.0
+            print(f"{name:<28} {size:>10} {stats['calls']:>8} {stats['seconds']:>10.4f} {per_call:>10.1f}")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark task extraction on synthetic meetings")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Meeting lengths in sentences (default: 10 100 1000 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size, best is kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic meetings (default: 0)")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE,
+                        help="Compare against results saved with --save-baseline (default: benchmark_baseline.json)")
+    parser.add_argument("--no-baseline", action="store_true", help="Do not compare against a baseline")
+    parser.add_argument("--save-baseline", type=str, help="Save these results as a baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown or memory growth against the baseline (default: 0.2)")
+    args = parser.parse_args()
+
+    # Read before running, so a baseline being replaced is still compared against
+    baseline = None
+    if not args.no_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.seed)
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Baseline saved to: {args.save_baseline}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"✗ {len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"✓ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Cascaded transcription: a small model for the whole recording, a larger one for its doubtful parts
+"""
+import os
+import re
+from typing import List, Dict, Tuple
+from audio_processor import AudioProcessor, SAMPLE_RATE
+from config import DEFAULT_PROFILE
+from roster import load_roster
+
+
+# Draft segments below this average token log-probability are decoded again
+MIN_AVG_LOGPROB = -0.7
+
+# ...and so are segments Whisper thinks are probably not speech at all
+MAX_NO_SPEECH_PROB = 0.5
+
+# Audio added around each doubtful segment, and the gap below which neighbours are decoded together
+REDECODE_PAD_SECONDS = 0.5
+REDECODE_MERGE_SECONDS = 1.0
+
+WORD = re.compile(r"[A-Za-z]+")
+
+
+class CascadeTranscriber:
+    def __init__(self, draft_model="tiny", final_model="medium", threads=None, cache=None,
+                 pcm_cache=None, vad=True, profile=DEFAULT_PROFILE, quantize=None, backend="whisper", roster=None):
+        """
+        Set up a fast draft model and a more accurate model for re-decoding
+
+        The final model is only loaded if some segment needs it.
+
+        Args:
+            draft_model: Whisper model that transcribes the whole recording
+            final_model: Whisper model that re-decodes low-confidence segments
+            threads: Number of CPU threads for inference (optional)
+            cache: TranscriptCache for finished transcripts (optional)
+            pcm_cache: PCMCache for decoded audio (optional)
+            vad: Cut silence out before inference, see AudioProcessor
+            profile: Decoding profile name from DECODE_PROFILES, used by both models
+            quantize: Weight quantization mode for both models, see AudioProcessor (optional)
+            backend: ASR backend name for both models, see AudioProcessor
+            roster: Roster whose names are checked for mishearings (optional, load_roster() default)
+        """
+        self.draft = AudioProcessor(model_name=draft_model, threads=threads, pcm_cache=pcm_cache,
+                                    vad=vad, profile=profile, quantize=quantize, backend=backend)
+        self.final = AudioProcessor(model_name=final_model, threads=threads, vad=vad, profile=profile,
+                                    quantize=quantize, backend=backend)
+        self.cache = cache
+        self.use_roster(roster or load_roster())
+
+    def use_roster(self, roster):
+        """Check draft segments for mishearings of another Roster's names"""
+        self.roster = roster
+
+    @property
+    def model_name(self):
+        """Both models, as used in transcript cache keys and reports"""
+        return f"{self.draft.model_name}>{self.final.model_name}"
+
+    @property
+    def pcm_cache(self):
+        """PCMCache the draft model decodes through"""
+        return self.draft.pcm_cache
+
+    @pcm_cache.setter
+    def pcm_cache(self, pcm_cache):
+        self.draft.pcm_cache = pcm_cache
+
+    @property
+    def vad(self):
+        """Whether silence is cut out before inference, for both models"""
+        return self.draft.vad
+
+    @vad.setter
+    def vad(self, vad):
+        self.draft.vad = self.final.vad = vad
+
+    @property
+    def profile(self):
+        """Decoding profile of both models"""
+        return self.draft.profile
+
+    @profile.setter
+    def profile(self, profile):
+        self.draft.profile = self.final.profile = profile
+
+    def _unknown_name(self, text: str) -> bool:
+        """Whether a word of text sounds or is spelled like a roster name without being one"""
+        for word in WORD.findall(text):
+            match = self.roster.match_name(word.lower())
+            if match is not None and match[1] < 1.0:
+                return True
+        return False
+
+    def doubtful(self, segment: Dict) -> bool:
+        """Whether a draft segment should be decoded again by the final model"""
+        return (
+            segment.get("avg_logprob", 0.0) < MIN_AVG_LOGPROB
+            or segment.get("no_speech_prob", 0.0) > MAX_NO_SPEECH_PROB
+            or self._unknown_name(segment["text"])
+        )
+
+    def _ranges(self, segments: List[Dict], duration: float) -> List[Tuple[float, float]]:
+        """Padded, merged time ranges covering the doubtful segments"""
+        ranges = []
+        for segment in segments:
+            if not self.doubtful(segment):
+                continue
+            start = max(0.0, segment["start"] - REDECODE_PAD_SECONDS)
+            end = min(duration, segment["end"] + REDECODE_PAD_SECONDS)
+            if ranges and start - ranges[-1][1] < REDECODE_MERGE_SECONDS:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def transcribe(self, audio_path):
+        """Convert audio to text, see transcribe_file"""
+        return self.transcribe_file(audio_path)["text"]
+
+    def transcribe_file(self, audio_path):
+        """
+        Transcribe with the draft model, then re-decode doubtful time ranges with the final model
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Dictionary with "text", "segments", "language", "duration",
+            "skipped_seconds" and "redecoded_seconds"
+        """
+        cache_key = None
+        if self.cache is not None:
+            options = self.draft.cache_options(
+                min_avg_logprob=MIN_AVG_LOGPROB, max_no_speech_prob=MAX_NO_SPEECH_PROB,
+                roster=[member["name"] for member in self.roster.members]
+            )
+            cache_key = self.cache.key(audio_path, self.model_name, options)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"Using cached transcript for {os.path.basename(audio_path)}")
+                return cached
+
+        print(f"Decoding audio: {os.path.basename(audio_path)}...")
+        audio = self.draft.load_audio(audio_path)
+        sample_rate = SAMPLE_RATE
+
+        print(f"Drafting transcript with {self.draft.model_name}...")
+        draft = self.draft.transcribe_audio(audio)
+        ranges = self._ranges(draft["segments"], draft["duration"])
+
+        segments = list(draft["segments"])
+        redecoded = sum(end - start for start, end in ranges)
+        if ranges:
+            print(f"Re-decoding {len(ranges)} low-confidence ranges ({redecoded:.1f}s) "
+                  f"with {self.final.model_name}...")
+        for start, end in ranges:
+            # Draft segments mostly inside the range are replaced by the final model's
+            kept = [segment for segment in segments
+                    if not start <= (segment["start"] + segment["end"]) / 2 <= end]
+            final = self.final.transcribe_audio(
+                audio[int(start * sample_rate):int(end * sample_rate)], offset=start
+            )
+            segments = sorted(kept + final["segments"], key=lambda segment: segment["start"])
+
+        speech = draft["duration"] - draft["skipped_seconds"]
+        share = redecoded / speech if speech > 0 else 0.0
+        print(f"Transcription completed with {share:.0%} of the speech re-decoded")
+
+        result = {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": draft["language"],
+            "duration": draft["duration"],
+            "skipped_seconds": draft["skipped_seconds"],
+            "redecoded_seconds": redecoded
+        }
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+        return result
@@ -0,0 +1,279 @@
+"""
+Command-line arguments shared by main.py and the server client
+"""
+import os
+import sys
+import glob
+import argparse
+from typing import List
+from config import SUPPORTED_FORMATS, DECODE_PROFILES, DEFAULT_PROFILE, QUANTIZE_MODES
+from metrics import METRICS_FORMATS
+from deadlines import parse_meeting_date
+
+
+def build_parser(prog=None):
+    """
+    Build the argument parser for processing meeting recordings
+
+    Args:
+        prog: Program name shown in usage (optional)
+
+    Returns:
+        argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Automated Task Assignment from Meeting Audio",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example usage:
+  python main.py audio_meeting.mp3
+  python main.py audio_meeting.wav --output tasks.csv
+  python main.py audio_meeting.m4a --model small
+  python main.py standup.mp3 --profile fast
+  python main.py standup.mp3 --model tiny --cascade medium
+  python main.py standup.mp3 --model small --quantize int8
+  python main.py recordings/ --output-dir reports/
+  python main.py "recordings/*.mp3" standup.m4a
+  python main.py --transcript meeting.txt --output tasks.csv
+  python main.py standup.mp3 --roster team.json
+  python main.py standup.mp3 --meeting-date 2024-05-06
+  python main.py standup.mp3 --metrics run.prom --metrics-format prometheus
+  cat meeting.txt | python main.py --transcript -
+        """
+    )
+    
+    parser.add_argument(
+        "audio_file",
+        type=str,
+        nargs="*",
+        help="Path to the input audio file. Several files, a directory or a glob run in batch mode"
+    )
+    
+    parser.add_argument(
+        "--transcript",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Extract tasks from an already transcribed text file instead of audio; "
+             "'-' reads standard input. Skips speech recognition entirely"
+    )
+    
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="base",
+        choices=["tiny", "base", "small", "medium", "large"],
+        help="Whisper model size (default: base)"
+    )
+    
+    parser.add_argument(
+        "--cascade",
+        type=str,
+        default=None,
+        choices=["tiny", "base", "small", "medium", "large"],
+        metavar="MODEL",
+        help="Draft with --model, then re-decode only low-confidence segments and misheard names "
+             "with this larger model (single process only)"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default="whisper",
+        choices=["whisper", "stub"],
+        help="Speech recognition backend. stub returns a canned transcript with realistic "
+             "timing and needs no model weights, for offline tests and benchmarks (default: whisper)"
+    )
+    
+    parser.add_argument(
+        "--quantize",
+        type=str,
+        default=None,
+        choices=QUANTIZE_MODES,
+        help="Run Whisper with dynamically quantized linear layers on the CPU; "
+             "the converted model is cached on disk (default: full fp32 weights)"
+    )
+    
+    parser.add_argument(
+        "--quantize-report",
+        action="store_true",
+        help="Transcribe the audio file with full and --quantize weights (int8 if not given) "
+             "and report speed, model size and word error rate instead of extracting tasks"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=DEFAULT_PROFILE,
+        choices=list(DECODE_PROFILES),
+        help="Decoding speed profile: fast pins English and decodes greedily without fallback, "
+             f"accurate uses beam search (default: {DEFAULT_PROFILE})"
+    )
+    
+    parser.add_argument(
+        "--roster",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="JSON or YAML file listing the team members, in the config.py TEAM_MEMBERS format "
+             "(default: ROSTER_FILE, or TEAM_MEMBERS in config.py)"
+    )
+    
+    parser.add_argument(
+        "--meeting-date",
+        type=str,
+        default=None,
+        metavar="YYYY-MM-DD",
+        help="Day the meeting was held; deadlines such as \"next Monday\" are turned into "
+             "due dates counted from it (default: today)"
+    )
+    
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Output CSV file path (optional)"
+    )
+    
+    parser.add_argument(
+        "--pdf",
+        type=str,
+        default=None,
+        nargs='?',
+        const="auto",
+        help="Save output as PDF. Use --pdf for auto-named file or --pdf filename.pdf for custom name"
+    )
+    
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=".",
+        help="Directory for per-recording CSV/PDF reports and the batch summary (batch mode, default: .)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Transcription processes, each with its own model. Batch mode spreads recordings "
+             "across them; a single recording is split into chunks (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="torch CPU threads per transcription process (default: torch default, or CPU count / workers with --workers)"
+    )
+    
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="Send silence to Whisper too instead of transcribing only detected speech"
+    )
+    
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write wall/CPU time, peak RSS and audio seconds of each stage (model load, decode, "
+             "inference, extraction, table, CSV, PDF) to FILE"
+    )
+    
+    parser.add_argument(
+        "--metrics-format",
+        type=str,
+        default="jsonl",
+        choices=METRICS_FORMATS,
+        help="jsonl writes one JSON object per stage run; prometheus writes per-stage totals "
+             "in the Prometheus text format (default: jsonl)"
+    )
+    
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the transcript and decoded audio caches"
+    )
+    cache_group.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Transcribe again and overwrite the cached transcript"
+    )
+    
+    return parser
+
+
+def check_inputs(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Exit with a usage error on argument combinations argparse cannot express"""
+    if args.transcript and args.audio_file:
+        parser.error("give either audio files or --transcript, not both")
+    if not args.transcript and not args.audio_file:
+        parser.error("an audio file or --transcript is required")
+    if getattr(args, "quantize_report", False) and (args.transcript or is_batch(args.audio_file)):
+        parser.error("--quantize-report needs a single audio file")
+    if getattr(args, "quantize_report", False) and getattr(args, "backend", "whisper") != "whisper":
+        parser.error("--quantize-report compares Whisper weights; it needs --backend whisper")
+    if getattr(args, "cascade", None) and args.workers > 1:
+        parser.error("--cascade runs in a single process; drop --workers")
+    if getattr(args, "meeting_date", None):
+        try:
+            parse_meeting_date(args.meeting_date)
+        except ValueError as e:
+            parser.error(str(e))
+
+
+def read_transcript(path: str) -> str:
+    """
+    Read transcript text from a file, or from standard input when path is '-'
+
+    Args:
+        path: Text file path or '-'
+
+    Returns:
+        Transcript text
+    """
+    if path == "-":
+        return sys.stdin.read()
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Transcript file not found: {path}")
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def collect_audio_files(inputs: List[str]) -> List[str]:
+    """
+    Expand files, directories and glob patterns into a list of recordings
+
+    Args:
+        inputs: Audio file paths, directories or glob patterns
+
+    Returns:
+        Audio file paths in the order given, directories and globs sorted by name
+    """
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(
+                os.path.join(item, name) for name in os.listdir(item)
+                if os.path.splitext(name.lower())[1] in SUPPORTED_FORMATS
+            )
+        elif glob.has_magic(item):
+            matches = sorted(path for path in glob.glob(item) if os.path.isfile(path))
+        else:
+            matches = [item]
+
+        if not matches:
+            print(f"Warning: No audio files found for {item}")
+
+        for path in matches:
+            if path not in files:
+                files.append(path)
+    return files
+
+
+def is_batch(inputs: List[str]) -> bool:
+    """Whether the command-line inputs name more than a single audio file"""
+    return len(inputs) > 1 or any(os.path.isdir(item) or glob.has_magic(item) for item in inputs)
@@ -0,0 +1,104 @@
+"""
+Thin client for server.py - same arguments as main.py, no model or heavy imports
+"""
+import os
+import sys
+import json
+import urllib.request
+import urllib.error
+from typing import Dict
+from cli import build_parser, check_inputs, read_transcript
+from config import SERVER_HOST, SERVER_PORT
+from metrics import MetricsRecorder
+
+
+def submit_job(server_url: str, job: Dict) -> Dict:
+    """
+    Send a job to the server and wait for its result
+
+    Args:
+        server_url: Base URL of server.py, e.g. http://127.0.0.1:8765
+        job: Job dictionary, see TaskServer.handle
+
+    Returns:
+        Result dictionary from the server
+    """
+    request = urllib.request.Request(
+        server_url.rstrip("/") + "/jobs",
+        data=json.dumps(job).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read()).get("error", str(e))
+        except ValueError:
+            message = str(e)
+        raise RuntimeError(message) from None
+
+
+def main():
+    parser = build_parser(prog="client.py")
+    parser.add_argument(
+        "--server",
+        type=str,
+        default=f"http://{SERVER_HOST}:{SERVER_PORT}",
+        help=f"URL of a running server.py (default: http://{SERVER_HOST}:{SERVER_PORT})"
+    )
+    args = parser.parse_args()
+    check_inputs(parser, args)
+
+    job = vars(args).copy()
+    job["cwd"] = os.getcwd()
+    server_url = job.pop("server")
+
+    try:
+        if args.transcript:
+            # Sent as text, so stdin works and the server need not see the file
+            job["transcript_text"] = read_transcript(args.transcript)
+        result = submit_job(server_url, job)
+    except FileNotFoundError as e:
+        print(f"\n✗ Error: {e}")
+        sys.exit(1)
+    except urllib.error.URLError as e:
+        print(f"\n✗ Error: Could not reach server at {server_url}: {e.reason}")
+        sys.exit(1)
+    except RuntimeError as e:
+        print(f"\n✗ Error: {e}")
+        sys.exit(1)
+
+    if args.metrics:
+        # The spans were recorded by the server, which did the work
+        recorder = MetricsRecorder()
+        for span in result.get("metrics", []):
+            recorder.record(span)
+        recorder.write(args.metrics, args.metrics_format)
+        print(f"✓ Metrics saved to: {args.metrics}")
+
+    if "recordings" in result:
+        for recording in result["recordings"]:
+            if recording["status"] == "ok":
+                print(f"✓ {recording['recording']}: {len(recording['tasks'])} tasks")
+            else:
+                print(f"✗ {recording['recording']}: {recording['error']}")
+        return
+
+    if not args.transcript:
+        print("\n" + "-"*80)
+        print("TRANSCRIBED TEXT:")
+        print("-"*80)
+        print(result["transcript"])
+        print("-"*80)
+    print(result["table"])
+    if result["csv"]:
+        print(f"\nTasks saved to {result['csv']}")
+    if result["pdf"]:
+        print(f"\n✓ PDF report saved to: {result['pdf']}")
+    print(f"\n✓ Processed {len(result['tasks'])} tasks successfully!")
+
+
+if __name__ == "__main__":
+    main()
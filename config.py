@@ -1,6 +1,12 @@
 """
 Configuration file for team members and their roles/skills
+
+Members may list "aliases": nicknames that do not sound like the name
+(e.g. "bob" for Robert). Misheard and misspelled names ("Moheet",
+"Sakshy") are matched phonetically and need no alias.
 """
+import os
+
 TEAM_MEMBERS = [
     {
         "name": "Sakshi",
@@ -24,6 +30,14 @@ TEAM_MEMBERS = [
     }
 ]
 
+# JSON or YAML file with the team, in the TEAM_MEMBERS format, used instead of
+# TEAM_MEMBERS when set; --roster overrides it for a run
+ROSTER_FILE = None
+
+# Transcript words that sound or are spelled this much like a roster name
+# (1.0 for the name itself) count as a mention of that member
+NAME_MATCH_MIN_CONFIDENCE = 0.75
+
 PRIORITY_KEYWORDS = {
     "critical": ["critical", "urgent", "blocking", "immediately", "asap"],
     "high": ["high priority", "important", "needs to be done", "should tackle", "before release"],
@@ -42,3 +56,54 @@ DEADLINE_PATTERNS = [
     r"by\s+(\d{1,2}[/-]\d{1,2})", 
 ]
 
+# How numeric deadlines such as "by 12/05" are read: "DM" for 12 May, "MD" for December 5
+DEADLINE_DATE_ORDER = "DM"
+
+
+SUPPORTED_FORMATS = ['.wav', '.mp3', '.m4a', '.flac', '.ogg']
+
+# Named Whisper decoding profiles, selected with --profile and passed to model.transcribe
+DECODE_PROFILES = {
+    # English meetings: no language detection, greedy decoding with no temperature
+    # fallback, no conditioning on earlier text and no timestamp tokens. The
+    # log-probability threshold stays: with no_speech_threshold it drops silent
+    # segments instead of letting the model invent text for them
+    "fast": {
+        "language": "en",
+        "temperature": 0.0,
+        "beam_size": None,
+        "best_of": None,
+        "compression_ratio_threshold": None,
+        "logprob_threshold": -1.0,
+        "condition_on_previous_text": False,
+        "without_timestamps": True
+    },
+    # Whisper's defaults: language detection, greedy decoding with temperature fallback
+    "balanced": {},
+    # Beam search, and more candidates when falling back to sampling
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "compression_ratio_threshold": 2.4,
+        "logprob_threshold": -1.0,
+        "condition_on_previous_text": True
+    }
+}
+DEFAULT_PROFILE = "balanced"
+
+# On-disk cache of transcripts, keyed by the audio content and model settings
+TRANSCRIPT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "meeting_task_assignment", "transcripts")
+TRANSCRIPT_CACHE_MAX_MB = 500
+
+# On-disk cache of decoded 16 kHz audio (about 230 MB per hour), keyed by the audio content
+PCM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "meeting_task_assignment", "pcm")
+PCM_CACHE_MAX_MB = 2000
+
+# Weight quantization modes for --quantize, and where converted models are kept
+QUANTIZE_MODES = ["int8"]
+QUANTIZED_MODEL_DIR = os.path.join(os.path.expanduser("~"), ".cache", "meeting_task_assignment", "models")
+
+# Address of server.py, the resident model server used by client.py
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
@@ -0,0 +1,102 @@
+"""
+Calendar dates for deadline phrases, relative to the meeting date
+"""
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Optional
+from config import DEADLINE_DATE_ORDER
+
+
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+
+# The working week ends on Friday
+END_OF_WEEK = WEEKDAYS["friday"]
+
+NUMERIC_DATE = re.compile(r"(\d{1,2})[/-](\d{1,2})")
+WORD = re.compile(r"[a-z]+")
+
+
+def parse_meeting_date(text: str) -> date:
+    """
+    Parse a meeting date given as YYYY-MM-DD
+
+    Raises:
+        ValueError: If text is not an ISO date
+    """
+    try:
+        return date.fromisoformat(text)
+    except (TypeError, ValueError):
+        raise ValueError(f"Meeting date must be YYYY-MM-DD: {text}") from None
+
+
+@lru_cache(maxsize=4096)
+def weekday_date(anchor: date, weekday: int, next_week: bool = False) -> date:
+    """
+    Date of a weekday as meant in a meeting held on anchor
+
+    Args:
+        anchor: Meeting date
+        weekday: 0 for Monday to 6 for Sunday
+        next_week: "next Friday", the weekday of the week after the meeting's;
+            otherwise the first such weekday after the meeting day
+
+    Returns:
+        date
+    """
+    if next_week:
+        return anchor + timedelta(days=7 - anchor.weekday() + weekday)
+    return anchor + timedelta(days=(weekday - anchor.weekday()) % 7 or 7)
+
+
+def _numeric_date(first: int, second: int, anchor: date) -> Optional[date]:
+    """The next day/month (or month/day, see DEADLINE_DATE_ORDER) on or after anchor"""
+    day, month = (first, second) if DEADLINE_DATE_ORDER == "DM" else (second, first)
+    for year in (anchor.year, anchor.year + 1):
+        try:
+            resolved = date(year, month, day)
+        except ValueError:
+            return None
+        if resolved >= anchor:
+            return resolved
+    return None
+
+
+@lru_cache(maxsize=4096)
+def resolve_deadline(phrase: str, anchor: date) -> Optional[date]:
+    """
+    Resolve a deadline phrase to a calendar date
+
+    Understands the phrases the task extractor reports: "Today", "Tomorrow
+    evening", "Friday", "Next Monday", "End of this week", "End of next
+    week", "By 12/05" and weekday phrases such as "Sunday morning".
+    Results are cached, since a meeting repeats the same few phrases.
+
+    Args:
+        phrase: Deadline phrase, in any case
+        anchor: Date of the meeting the phrase was said in
+
+    Returns:
+        date, or None when the phrase names no date (e.g. "Before release")
+    """
+    lower = phrase.lower()
+    numeric = NUMERIC_DATE.search(lower)
+    if numeric:
+        return _numeric_date(int(numeric.group(1)), int(numeric.group(2)), anchor)
+
+    words = WORD.findall(lower)
+    if "today" in words:
+        return anchor
+    if "tomorrow" in words:
+        return anchor + timedelta(days=1)
+    if "end" in words and "week" in words:
+        if "next" in words:
+            return weekday_date(anchor, END_OF_WEEK, next_week=True)
+        return max(anchor, anchor + timedelta(days=END_OF_WEEK - anchor.weekday()))
+    for word in words:
+        if word in WEEKDAYS:
+            return weekday_date(anchor, WEEKDAYS[word], next_week="next" in words)
+    return None
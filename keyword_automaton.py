@@ -0,0 +1,197 @@
+"""
+Aho-Corasick keyword automaton: every keyword of every vocabulary found in one pass over a text
+"""
+import re
+from collections import deque
+from typing import List, Dict, Set, NamedTuple, Any
+
+
+class KeywordHit(NamedTuple):
+    """One occurrence of a keyword in a scanned text"""
+    start: int
+    end: int
+    keyword: str
+    category: str
+    value: Any
+    # No letter, digit or underscore right before or after it, as with a regex \b...\b
+    whole_word: bool
+
+
+def _word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordHits:
+    """
+    Hits of one scan, grouped by category
+
+    KeywordHit tuples are only made for the categories a caller asks for.
+    """
+
+    def __init__(self, text: str, found, entries: List[tuple]):
+        self.text = text
+        self.entries = entries
+        # category -> (start, entry index) of each occurrence
+        self.by_category: Dict[str, List[tuple]] = {}
+        for start, entry in found:
+            self.by_category.setdefault(entries[entry][1], []).append((start, entry))
+        self._hits: Dict[str, List[KeywordHit]] = {}
+
+    def get(self, category: str, whole_words: bool = False) -> List[KeywordHit]:
+        """Hits of a category in the order they end in the text, optionally whole words only"""
+        hits = self._hits.get(category)
+        if hits is None:
+            text = self.text
+            hits = []
+            for start, entry in self.by_category.get(category, ()):
+                keyword, _, value = self.entries[entry]
+                end = start + len(keyword)
+                whole_word = not (start > 0 and _word_char(text[start - 1])) and not (end < len(text) and _word_char(text[end]))
+                hits.append(KeywordHit(start, end, keyword, category, value, whole_word))
+            hits.sort(key=lambda hit: (hit.end, hit.start))
+            self._hits[category] = hits
+        if whole_words:
+            return [hit for hit in hits if hit.whole_word]
+        return hits
+
+    def values(self, category: str, whole_words: bool = False) -> Set:
+        """Values of the keywords of a category that occur"""
+        if not whole_words:
+            return {self.entries[entry][2] for _, entry in self.by_category.get(category, ())}
+        return {hit.value for hit in self.get(category, whole_words)}
+
+
+class KeywordAutomaton:
+    def __init__(self):
+        """
+        Collect keywords, each with a category and a value, then build() once and scan() many texts
+
+        The keywords form an Aho-Corasick automaton: a trie with failure
+        links. Scanning text character by character in Python is slower than
+        the separate C-level regex searches it replaces, so build() also
+        compiles the trie into one regular expression. A scan then runs that
+        regex over the text once, finding the longest keyword at each
+        position. The keywords hidden inside or overlapping each of those
+        matches are precomputed with the automaton, so no occurrence is lost.
+
+        One keyword may be added under several categories; each gives its
+        own hit. Keywords are matched as written, so add them lowercase to
+        scan lowercase text.
+        """
+        self.entries: List[tuple] = []
+        # Trie transitions, failure links and the entries ending at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._built = False
+
+    def add(self, keyword: str, category: str, value: Any = None):
+        """Add a keyword; value is returned with its hits (e.g. a priority level or skill owners)"""
+        if not keyword:
+            raise ValueError("Keywords must not be empty")
+        state = 0
+        for char in keyword:
+            following = self._goto[state].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = following
+            state = following
+        self._out[state].append(len(self.entries))
+        self.entries.append((keyword, category, value))
+        self._built = False
+
+    def build(self):
+        """Link the automaton and compile the scanning regex"""
+        # A keyword's own entries, before failure links add those of its suffixes
+        own = {state: list(entries) for state, entries in enumerate(self._out) if entries}
+
+        # Failure links, breadth first: the longest proper suffix that is a trie path
+        self._fail = [0] * len(self._goto)
+        self._out = [list(own.get(state, ())) for state in range(len(self._goto))]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(char, 0)
+                self._out[following] = self._out[following] + self._out[self._fail[following]]
+
+        self._pattern = re.compile(self._trie_pattern(0, own)) if own else None
+
+        # Per keyword: every entry occurring inside it, with its offset, and the
+        # offsets where a longer keyword could start inside it and run past its end
+        self._inside: Dict[str, List[tuple]] = {}
+        self._overlaps: Dict[str, List[int]] = {}
+        for entries in own.values():
+            keyword = self.entries[entries[0]][0]
+            self._inside[keyword] = list(self._walk(keyword))
+            self._overlaps[keyword] = [
+                offset for offset in range(1, len(keyword)) if self._reaches(keyword[offset:])
+            ]
+        self._built = True
+
+    def _trie_pattern(self, state: int, own: Dict[int, List[int]]) -> str:
+        """The trie below state as a regex that prefers the longest keyword"""
+        branches = [
+            re.escape(char) + self._trie_pattern(following, own)
+            for char, following in self._goto[state].items()
+        ]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if state in own else pattern
+
+    def _reaches(self, text: str) -> bool:
+        """Whether text is a trie path that keeps going, i.e. a keyword could continue it"""
+        state = 0
+        for char in text:
+            state = self._goto[state].get(char)
+            if state is None:
+                return False
+        return bool(self._goto[state])
+
+    def _walk(self, text: str):
+        """Run the automaton over text, yielding (start, entry) for every keyword occurrence"""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for entry in self._out[state]:
+                yield index + 1 - len(self.entries[entry][0]), entry
+
+    def scan(self, text: str) -> KeywordHits:
+        """
+        Find every occurrence of every keyword, overlapping ones included
+
+        Args:
+            text: Text to search, e.g. a lowercase task context
+
+        Returns:
+            KeywordHits
+        """
+        if not self._built:
+            self.build()
+        if self._pattern is None:
+            return KeywordHits(text, (), self.entries)
+
+        found = set()
+        inside, overlaps, pattern = self._inside, self._overlaps, self._pattern
+        for match in pattern.finditer(text):
+            pending = [(match.start(), match.group())]
+            while pending:
+                start, keyword = pending.pop()
+                for offset, entry in inside[keyword]:
+                    found.add((start + offset, entry))
+                # A keyword starting inside this one but ending after it
+                for offset in overlaps[keyword]:
+                    longer = pattern.match(text, start + offset)
+                    if longer is not None and longer.end() > start + len(keyword):
+                        pending.append((longer.start(), longer.group()))
+        return KeywordHits(text, found, self.entries)
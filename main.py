@@ -2,65 +2,106 @@
 Main application entry point for Meeting Task Assignment System
 """
 import sys
-import argparse
-from audio_processor import AudioProcessor
-from task_extractor import TaskExtractor
+from task_extractor import TaskExtractor, StreamingTaskExtractor
 from output_formatter import OutputFormatter
+from cli import build_parser, check_inputs, collect_audio_files, is_batch, read_transcript
+from transcript_cache import TranscriptCache
+from roster import load_roster
+from deadlines import parse_meeting_date
+import metrics
+
+# Whisper, torch and the transcription modules are imported by the stages that
+# use them, so --help and --transcript start without loading them
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="Automated Task Assignment from Meeting Audio",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Example usage:
-  python main.py audio_meeting.mp3
-  python main.py audio_meeting.wav --output tasks.csv
-  python main.py audio_meeting.m4a --model small
-        """
-    )
+    parser = build_parser()
+    args = parser.parse_args()
+    check_inputs(parser, args)
     
-    parser.add_argument(
-        "audio_file",
-        type=str,
-        help="Path to the input audio file"
-    )
+    if args.metrics:
+        metrics.recorder.enable()
+    try:
+        run(args)
+    finally:
+        # Written on failures too; the spans show how far the run got
+        if args.metrics:
+            metrics.recorder.write(args.metrics, args.metrics_format)
+            print(f"✓ Metrics saved to: {args.metrics}")
+
+
+def run(args):
+    """Process the recordings or transcript named by the parsed arguments"""
+    try:
+        args.team = load_roster(args.roster)
+    except (FileNotFoundError, ValueError, ImportError) as e:
+        print(f"\n✗ Error: Could not load roster: {e}")
+        sys.exit(1)
+    # Checked by check_inputs; deadlines resolve from today when not given
+    args.meeting_day = parse_meeting_date(args.meeting_date) if args.meeting_date else None
     
-    parser.add_argument(
-        "--model",
-        type=str,
-        default="base",
-        choices=["tiny", "base", "small", "medium", "large"],
-        help="Whisper model size (default: base)"
-    )
+    if args.transcript:
+        run_transcript(args)
+        return
     
-    parser.add_argument(
-        "--output",
-        type=str,
-        default=None,
-        help="Output CSV file path (optional)"
-    )
+    args.cache = None if args.no_cache else TranscriptCache(refresh=args.refresh_cache)
+    from pcm_cache import PCMCache
+    args.pcm_cache = None if args.no_cache else PCMCache()
     
-    parser.add_argument(
-        "--pdf",
-        type=str,
-        default=None,
-        nargs='?',
-        const="auto",
-        help="Save output as PDF. Use --pdf for auto-named file or --pdf filename.pdf for custom name"
-    )
+    if is_batch(args.audio_file):
+        run_batch(args)
+        return
     
-    args = parser.parse_args()
+    if args.quantize_report:
+        run_quantize_report(args)
+        return
+    
+    args.audio_file = args.audio_file[0]
     
     print("="*80)
     print("MEETING TASK ASSIGNMENT SYSTEM")
     print("="*80)
     print(f"\nProcessing audio file: {args.audio_file}")
-    print(f"Using Whisper model: {args.model}\n")
+    print(f"Using Whisper model: {args.model} (profile: {args.profile})\n")
     
     try:
-        audio_processor = AudioProcessor(model_name=args.model)
-        transcript = audio_processor.transcribe(args.audio_file)
+        if args.cascade:
+            from cascade_transcriber import CascadeTranscriber
+            transcriber = CascadeTranscriber(
+                args.model, args.cascade, threads=args.threads, cache=args.cache,
+                pcm_cache=args.pcm_cache, vad=not args.no_vad, profile=args.profile,
+                quantize=args.quantize, backend=args.backend, roster=args.team
+            )
+            transcript = transcriber.transcribe_file(args.audio_file)["text"]
+            tasks = None
+        elif args.workers > 1:
+            from parallel_transcriber import ParallelTranscriber
+            with ParallelTranscriber(
+                args.model, workers=args.workers, threads=args.threads,
+                cache=args.cache, pcm_cache=args.pcm_cache, vad=not args.no_vad,
+                profile=args.profile, quantize=args.quantize, backend=args.backend
+            ) as transcriber:
+                transcript = transcriber.transcribe_chunked(args.audio_file)["text"]
+            tasks = None
+        else:
+            from audio_processor import AudioProcessor
+            audio_processor = AudioProcessor(
+                model_name=args.model, threads=args.threads, cache=args.cache,
+                pcm_cache=args.pcm_cache, vad=not args.no_vad, profile=args.profile,
+                quantize=args.quantize, backend=args.backend
+            )
+            streaming_extractor = StreamingTaskExtractor(TaskExtractor(args.team, args.meeting_day))
+            print("Transcribing audio to text...")
+            parts = []
+            for segment in audio_processor.iter_segments(args.audio_file):
+                print(f"[{format_timestamp(segment['start'])} --> {format_timestamp(segment['end'])}] "
+                      f"{segment['text'].strip()}")
+                parts.append(segment["text"])
+                print_new_tasks(streaming_extractor.feed(segment["text"]))
+            print_new_tasks(streaming_extractor.flush())
+            transcript = "".join(parts)
+            tasks = streaming_extractor.tasks
+            print(f"Transcription completed. Length: {len(transcript)} characters")
         
         print("\n" + "-"*80)
         print("TRANSCRIBED TEXT:")
@@ -68,9 +109,10 @@ Example usage:
         print(transcript)
         print("-"*80)
 
-        print("\nExtracting tasks from transcript...")
-        task_extractor = TaskExtractor()
-        tasks = task_extractor.extract_tasks(transcript)
+        if tasks is None:
+            print("\nExtracting tasks from transcript...")
+            task_extractor = TaskExtractor(args.team, args.meeting_day)
+            tasks = task_extractor.extract_tasks(transcript)
         
         formatter = OutputFormatter()
         formatter.display_table(tasks)
@@ -87,7 +129,13 @@ Example usage:
         else:
             pdf_path = None
         
-        formatter.save_to_pdf(tasks, pdf_path, args.audio_file)
+        model = f"{args.model}, {args.cascade} for low-confidence segments" if args.cascade else args.model
+        if args.quantize:
+            model = f"{model} ({args.quantize})"
+        if args.backend != "whisper":
+            model = f"{model} [{args.backend} backend]"
+        details = {"Whisper Model": model, "Decoding Profile": args.profile}
+        formatter.save_to_pdf(tasks, pdf_path, args.audio_file, details)
         
         print(f"\n✓ Processed {len(tasks)} tasks successfully!")
         
@@ -101,6 +149,108 @@ Example usage:
         sys.exit(1)
 
 
+def run_transcript(args):
+    """Extract tasks from already transcribed text, without loading any speech model"""
+    source = "standard input" if args.transcript == "-" else args.transcript
+    print("="*80)
+    print("MEETING TASK ASSIGNMENT SYSTEM")
+    print("="*80)
+    print(f"\nProcessing transcript: {source}")
+    
+    try:
+        transcript = read_transcript(args.transcript)
+    except FileNotFoundError as e:
+        print(f"\n✗ Error: {e}")
+        sys.exit(1)
+    
+    print("\nExtracting tasks from transcript...")
+    tasks = TaskExtractor(args.team, args.meeting_day).extract_tasks(transcript)
+    
+    formatter = OutputFormatter()
+    formatter.display_table(tasks)
+    
+    if args.output:
+        formatter.save_to_csv(tasks, args.output)
+    
+    # Unlike audio runs, a PDF is only written when asked for; reportlab is then
+    # never imported on the text-only path
+    if args.pdf:
+        pdf_path = None if args.pdf == "auto" else args.pdf
+        audio_file = None if args.transcript == "-" else args.transcript
+        formatter.save_to_pdf(tasks, pdf_path, audio_file)
+    
+    print(f"\n✓ Processed {len(tasks)} tasks successfully!")
+
+
+def run_quantize_report(args):
+    """Report the speed/accuracy tradeoff of quantized weights on a reference recording"""
+    from quantization import compare_quantized
+    mode = args.quantize or "int8"
+    
+    print("="*80)
+    print(f"QUANTIZATION REPORT - {args.model} ({mode})")
+    print("="*80)
+    
+    try:
+        report = compare_quantized(
+            args.audio_file, args.model, mode,
+            threads=args.threads, pcm_cache=args.pcm_cache, vad=not args.no_vad, profile=args.profile
+        )
+    except FileNotFoundError as e:
+        print(f"\n✗ Error: {e}")
+        sys.exit(1)
+    
+    full, quantized = report["full"], report["quantized"]
+    print(f"\n{'':<12}{'Seconds':>10}{'Model MB':>12}")
+    print(f"{'fp32':<12}{full['seconds']:>10.1f}{full['model_mb']:>12.1f}")
+    print(f"{mode:<12}{quantized['seconds']:>10.1f}{quantized['model_mb']:>12.1f}")
+    print(f"\nSpeedup: {report['speedup']:.2f}x")
+    print(f"Word error rate against fp32: {report['wer']:.1%}")
+
+
+def format_timestamp(seconds):
+    """Format seconds as H:MM:SS for live transcript lines"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def print_new_tasks(tasks):
+    """Announce tasks found while the meeting is still being transcribed"""
+    for task in tasks:
+        print(f"  → Task #{task['id']}: {task['task']} ({task['assigned_to']}, {task['deadline']})")
+
+
+def run_batch(args):
+    """Process several recordings with one loaded model"""
+    print("="*80)
+    print("MEETING TASK ASSIGNMENT SYSTEM - BATCH MODE")
+    print("="*80)
+    
+    audio_files = collect_audio_files(args.audio_file)
+    if not audio_files:
+        print("\n✗ Error: No audio files to process")
+        sys.exit(1)
+    
+    print(f"\nProcessing {len(audio_files)} recordings")
+    print(f"Using Whisper model: {args.model} (profile: {args.profile})\n")
+    
+    from batch_processor import BatchProcessor
+    batch = BatchProcessor(
+        model_name=args.model, workers=args.workers, threads=args.threads,
+        cache=args.cache, pcm_cache=args.pcm_cache, vad=not args.no_vad, profile=args.profile,
+        cascade=args.cascade, quantize=args.quantize, backend=args.backend, roster=args.team,
+        meeting_date=args.meeting_day
+    )
+    try:
+        results = batch.run(audio_files, args.output_dir)
+    finally:
+        batch.close()
+    
+    if not any(result["status"] == "ok" for result in results):
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
 
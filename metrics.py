@@ -0,0 +1,177 @@
+"""
+Per-stage timing and resource spans, exported as JSON lines or Prometheus text
+"""
+import sys
+import json
+import time
+from contextlib import contextmanager
+from typing import List, Dict
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then reported as None
+    resource = None
+
+
+METRICS_FORMATS = ["jsonl", "prometheus"]
+
+# Prefix of every exported Prometheus metric
+PROMETHEUS_PREFIX = "meeting_tasks"
+
+
+def peak_rss_bytes():
+    """Highest resident set size of this process so far, in bytes (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageSpan:
+    """
+    One timed run of a pipeline stage
+
+    Code inside the span may set audio_seconds once it knows how much audio
+    the stage processed.
+    """
+
+    def __init__(self, stage: str, audio_seconds: float = None, parent: str = None, **labels):
+        self.stage = stage
+        self.audio_seconds = audio_seconds
+        self.parent = parent
+        self.labels = labels
+        self.started = None
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.peak_rss_bytes = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "stage": self.stage,
+            "parent": self.parent,
+            "started": self.started,
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "audio_seconds": self.audio_seconds,
+            "labels": self.labels
+        }
+
+
+class MetricsRecorder:
+    def __init__(self):
+        """
+        Collect spans of the pipeline stages
+
+        Recording is off until enable() is called; until then span() only
+        runs its block, so instrumented code pays next to nothing.
+        """
+        self.enabled = False
+        self.spans: List[Dict] = []
+        # Per-stage sums for Prometheus, kept when spans are cleared
+        self.totals: Dict[str, Dict] = {}
+        self.peak_rss = None
+        self._open: List[str] = []
+
+    def enable(self):
+        """Start recording spans"""
+        self.enabled = True
+
+    def clear(self):
+        """Forget recorded spans; the per-stage totals keep counting"""
+        self.spans = []
+
+    @contextmanager
+    def span(self, stage: str, audio_seconds: float = None, **labels):
+        """
+        Time a block as one run of a stage
+
+        Records wall and CPU time of the process, its peak RSS at the end of
+        the block and the audio duration processed. Spans opened inside the
+        block record this stage as their parent.
+
+        Args:
+            stage: Stage name, e.g. "decode", "inference", "extraction"
+            audio_seconds: Audio processed, if known before the block runs
+            labels: Extra JSON-serializable details, e.g. the model name
+
+        Yields:
+            The StageSpan, whose audio_seconds the block may set
+        """
+        span = StageSpan(stage, audio_seconds, self._open[-1] if self._open else None, **labels)
+        if not self.enabled:
+            yield span
+            return
+
+        self._open.append(stage)
+        span.started = time.time()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall_seconds = time.perf_counter() - wall
+            span.cpu_seconds = time.process_time() - cpu
+            span.peak_rss_bytes = peak_rss_bytes()
+            self._open.pop()
+            self.record(span.to_dict())
+
+    def record(self, span: Dict):
+        """Add a finished span, as produced by StageSpan.to_dict (e.g. received from the server)"""
+        self.spans.append(span)
+        totals = self.totals.setdefault(span["stage"], {"runs": 0, "wall": 0.0, "cpu": 0.0, "audio": 0.0})
+        totals["runs"] += 1
+        totals["wall"] += span["wall_seconds"]
+        totals["cpu"] += span["cpu_seconds"]
+        totals["audio"] += span["audio_seconds"] or 0.0
+        if span["peak_rss_bytes"] is not None:
+            self.peak_rss = max(self.peak_rss or 0, span["peak_rss_bytes"])
+
+    def json_lines(self) -> str:
+        """Recorded spans, one JSON object per line"""
+        return "".join(json.dumps(span) + "\n" for span in self.spans)
+
+    def prometheus(self) -> str:
+        """Per-stage totals in the Prometheus text exposition format"""
+        series = [
+            ("stage_runs_total", "counter", "Completed runs of each pipeline stage", "runs"),
+            ("stage_wall_seconds_total", "counter", "Wall-clock seconds spent in each pipeline stage", "wall"),
+            ("stage_cpu_seconds_total", "counter", "Process CPU seconds spent in each pipeline stage", "cpu"),
+            ("stage_audio_seconds_total", "counter", "Seconds of audio processed by each pipeline stage", "audio"),
+        ]
+        lines = []
+        for name, kind, help_text, key in series:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {kind}")
+            for stage, totals in sorted(self.totals.items()):
+                lines.append(f'{PROMETHEUS_PREFIX}_{name}{{stage="{stage}"}} {totals[key]:.6g}')
+        if self.peak_rss is not None:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_peak_rss_bytes Highest resident set size seen at the end of a stage")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_peak_rss_bytes gauge")
+            lines.append(f"{PROMETHEUS_PREFIX}_peak_rss_bytes {self.peak_rss}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, metrics_format: str = "jsonl"):
+        """
+        Save the metrics to a file
+
+        Args:
+            path: Output file path
+            metrics_format: "jsonl" for one span per line, "prometheus" for per-stage totals
+        """
+        if metrics_format not in METRICS_FORMATS:
+            raise ValueError(f"Unknown metrics format: {metrics_format}")
+        text = self.json_lines() if metrics_format == "jsonl" else self.prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# Recorder the instrumented modules report to
+recorder = MetricsRecorder()
+
+
+def span(stage: str, audio_seconds: float = None, **labels):
+    """Time a block as one run of a stage on the shared recorder, see MetricsRecorder.span"""
+    return recorder.span(stage, audio_seconds, **labels)
@@ -0,0 +1,307 @@
+"""
+Fuzzy and phonetic matching of transcript words against roster names
+"""
+from typing import List, Dict, Optional, Tuple, Iterable
+
+
+VOWELS = set("aeiouy")
+
+# Words shorter than this are never fuzzy matched ("ok", "api", "we")
+MIN_FUZZY_LENGTH = 3
+
+# Names this short only match words that add letters to them: a changed letter
+# in a four-letter name usually makes an ordinary word (Lata -> late, data)
+SHORT_NAME_LENGTH = 4
+
+# Words this short only match a name one edit away that also sounds like it:
+# most short words are two edits from some name ("mit", "moot", "modi" -> Mohit)
+SHORT_WORD_LENGTH = 4
+
+# Largest edit distance a misspelled name is searched with
+MAX_EDIT_DISTANCE = 2
+
+# Matches kept per word before the oldest are dropped
+MEMO_SIZE = 100000
+
+
+def phonetic_keys(word: str) -> Tuple[str, str]:
+    """
+    Double Metaphone style primary and alternate sound keys of a word
+
+    A reduced rule set for names: consonants map to sound classes, vowels
+    after the first letter and a non-initial H are dropped, and doubled
+    letters count once. "th", "ch" and a soft "g" get a second reading,
+    so "Mohith", "Moheet" and "Mohit" all share the key "MT".
+
+    Args:
+        word: Lowercase word
+
+    Returns:
+        (primary, alternate) keys; equal when the word has one reading
+    """
+    word = "".join(letter for letter in word if "a" <= letter <= "z")
+    if word[:2] in ("kn", "gn", "pn", "wr", "ps"):
+        word = word[1:]
+    if word.startswith("x"):
+        word = "s" + word[1:]
+
+    primary, alternate = [], []
+
+    def add(sound, other=None):
+        primary.append(sound)
+        alternate.append(sound if other is None else other)
+
+    index = 0
+    length = len(word)
+    while index < length:
+        letter = word[index]
+        following = word[index + 1] if index + 1 < length else ""
+        after = word[index + 2] if index + 2 < length else ""
+        if letter == following and letter != "c":
+            index += 1
+            continue
+
+        step = 1
+        if letter in VOWELS and letter != "y":
+            if index == 0:
+                add("A")
+        elif letter == "b":
+            if not (index == length - 1 and index > 0 and word[index - 1] == "m"):
+                add("P")
+        elif letter == "c":
+            if following == "h":
+                add("X", "K")
+                step = 2
+            elif following in ("i", "e", "y"):
+                add("S")
+            elif following in ("c", "k", "q"):
+                add("K")
+                step = 2
+            else:
+                add("K")
+        elif letter == "d":
+            if following == "g" and after in ("e", "i", "y"):
+                add("J")
+                step = 2
+            else:
+                add("T")
+        elif letter == "g":
+            if following == "h":
+                if after and after not in VOWELS:
+                    step = 2
+                else:
+                    add("K")
+                    step = 2
+            elif following == "n":
+                pass
+            elif following in ("e", "i", "y"):
+                add("J", "K")
+            else:
+                add("K")
+        elif letter == "h":
+            if index == 0:
+                add("H")
+        elif letter == "p":
+            if following == "h":
+                add("F")
+                step = 2
+            else:
+                add("P")
+        elif letter == "q":
+            add("K")
+        elif letter == "s":
+            if following == "h" or (following == "i" and after in ("o", "a")):
+                add("X")
+                step = 2 if following == "h" else 1
+            else:
+                add("S")
+        elif letter == "t":
+            if following == "h":
+                add("0", "T")
+                step = 2
+            elif following == "i" and after in ("o", "a"):
+                add("X")
+            else:
+                add("T")
+        elif letter == "v":
+            add("F")
+        elif letter == "w":
+            if following in VOWELS:
+                add("W", "F")
+        elif letter == "x":
+            add("KS")
+        elif letter == "y":
+            if following in VOWELS:
+                add("Y")
+        elif letter == "z":
+            add("S")
+        else:
+            # f, j, k, l, m, n, r sound as written
+            add(letter.upper())
+        index += step
+
+    return "".join(primary), "".join(alternate)
+
+
+def edit_distance(a: str, b: str, limit: int = None) -> int:
+    """
+    Levenshtein distance between two words
+
+    Args:
+        a, b: Words
+        limit: Stop early and return limit + 1 once the distance must exceed it (optional)
+
+    Returns:
+        Number of single-letter insertions, deletions and substitutions
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, letter_a in enumerate(a, 1):
+        current = [i]
+        for j, letter_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (letter_a != letter_b)
+            ))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def deletions(word: str, count: int) -> set:
+    """Every string left after deleting up to count letters of word, word included"""
+    found = {word}
+    frontier = {word}
+    for _ in range(count):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        found |= frontier
+    return found
+
+
+class DeletionIndex:
+    """
+    Words indexed by their deletion neighbourhood, for edit-distance search
+
+    Two words within n edits of each other share a string reachable by
+    deleting at most n letters from each, so a search looks up the query's
+    own deletions instead of comparing it with every word. The cost depends
+    on the query's length, not on how many words are indexed.
+    """
+
+    def __init__(self, words: Iterable[str] = (), max_distance: int = MAX_EDIT_DISTANCE):
+        self.max_distance = max_distance
+        # deletion variant -> words it was made from
+        self.variants: Dict[str, List[str]] = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        for variant in deletions(word, self.max_distance):
+            self.variants.setdefault(variant, []).append(word)
+
+    def search(self, word: str, radius: int) -> List[Tuple[str, int]]:
+        """Words within radius edits of word (radius at most max_distance), with their distances"""
+        candidates = set()
+        for variant in deletions(word, min(radius, self.max_distance)):
+            candidates.update(self.variants.get(variant, ()))
+        found = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, radius)
+            if distance <= radius:
+                found.append((candidate, distance))
+        return found
+
+
+class NameIndex:
+    def __init__(self, terms: Iterable[str]):
+        """
+        Index name words for exact, phonetic and edit-distance lookups
+
+        Args:
+            terms: Lowercase name and alias words; earlier terms win ties
+        """
+        self.order: Dict[str, int] = {}
+        for term in terms:
+            self.order.setdefault(term, len(self.order))
+        self.keys = {term: set(phonetic_keys(term)) - {""} for term in self.order}
+        self.phonetic: Dict[str, List[str]] = {}
+        for term, keys in self.keys.items():
+            for key in keys:
+                self.phonetic.setdefault(key, []).append(term)
+        self.spellings = DeletionIndex(self.order)
+        self._memo: Dict[str, Optional[Tuple[str, float]]] = {}
+
+    def confidence(self, word: str, term: str, distance: int = None) -> float:
+        """
+        How likely word is term, misheard or misspelled
+
+        Edit similarity (1 - distance / longer length), lifted halfway to 1
+        when the two words share a phonetic key. A short term only matches
+        words that contain it letter by letter, and a short word only a term
+        one edit away with the same sound.
+
+        Returns:
+            Confidence from 0.0 to 1.0; 1.0 only for the term itself
+        """
+        if word == term:
+            return 1.0
+        if distance is None:
+            distance = edit_distance(word, term)
+        if len(term) <= SHORT_NAME_LENGTH and distance != len(word) - len(term):
+            return 0.0
+        sounds_alike = bool(set(phonetic_keys(word)) & self.keys.get(term, set()))
+        if len(word) <= SHORT_WORD_LENGTH and (distance > 1 or not sounds_alike):
+            return 0.0
+        similarity = max(0.0, 1.0 - distance / max(len(word), len(term)))
+        if sounds_alike:
+            similarity = (1.0 + similarity) / 2
+        return min(similarity, 0.99)
+
+    def match(self, word: str, min_confidence: float = 0.0) -> Optional[Tuple[str, float]]:
+        """
+        The indexed term a word most likely stands for
+
+        Candidates are the terms sharing a phonetic key with the word plus
+        the terms within MAX_EDIT_DISTANCE edits of it, both found by dictionary
+        lookups, so the cost does not grow with the number of names.
+
+        Args:
+            word: Lowercase transcript word
+            min_confidence: Ignore matches below this confidence
+
+        Returns:
+            (term, confidence), or None when no term is close enough
+        """
+        if word in self.order:
+            return word, 1.0
+        if word not in self._memo:
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[word] = self._best(word)
+        best = self._memo[word]
+        if best is None or best[1] < min_confidence:
+            return None
+        return best
+
+    def _best(self, word: str) -> Optional[Tuple[str, float]]:
+        if len(word) < MIN_FUZZY_LENGTH:
+            return None
+        candidates = dict(self.spellings.search(word, MAX_EDIT_DISTANCE))
+        for key in set(phonetic_keys(word)):
+            for term in self.phonetic.get(key, ()):
+                candidates.setdefault(term, None)
+
+        best = None
+        for term, distance in candidates.items():
+            confidence = self.confidence(word, term, distance)
+            if confidence <= 0.0:
+                continue
+            if (best is None or confidence > best[1]
+                    or (confidence == best[1] and self.order[term] < self.order[best[0]])):
+                best = (term, confidence)
+        return best
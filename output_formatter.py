@@ -1,58 +1,120 @@
 """
 Output formatter for task assignment results
 """
-import pandas as pd
-from typing import List, Dict
+import csv
+from typing import List, Dict, Iterator
 import os
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+import metrics
+
+# reportlab (through pdf_report), and pandas for format_tasks, are imported where
+# they are used; they take longer to import than the rest of the pipeline takes to run
+
+# Report columns: header, task key and the value shown when the key is missing
+TASK_COLUMNS = [
+    ("#", "id", ""),
+    ("Task", "task", ""),
+    ("Assigned To", "assigned_to", "Unassigned"),
+    ("Deadline", "deadline", "Not specified"),
+    ("Due Date", "deadline_date", ""),
+    ("Priority", "priority", "Medium"),
+    ("Dependencies", "dependencies", ""),
+    ("Reason", "reason", ""),
+    ("Critical Path", "critical_path", ""),
+]
+
+# Console table cells longer than this are cut and end in "...", as pandas'
+# display.max_colwidth printed them; CSV and PDF keep the full text
+MAX_CELL_WIDTH = 30
+
+BATCH_SUMMARY_COLUMNS = [
+    "Recording", "Status", "Tasks", "Audio Seconds", "Silence Skipped", "Profile",
+    "Wall Seconds", "Audio-s/s", "Error"
+]
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _cell(value) -> str:
+    text = _text(value)
+    return text if len(text) <= MAX_CELL_WIDTH else text[:MAX_CELL_WIDTH - 3] + "..."
 
 
 class OutputFormatter:
     def __init__(self):
         pass
     
-    def _escape_html(self, text: str) -> str:
-        """Escape HTML special characters for PDF Paragraph"""
-        if not text:
-            return ""
-        text = str(text)
-        text = text.replace("&", "&amp;")
-        text = text.replace("<", "&lt;")
-        text = text.replace(">", "&gt;")
-        return text
+    def _headers(self, tasks: List[Dict]) -> List[str]:
+        """Column headers, with Recording first when tasks come from several recordings"""
+        headers = [header for header, _, _ in TASK_COLUMNS]
+        if any("recording" in task for task in tasks):
+            headers.insert(0, "Recording")
+        return headers
     
-    def format_tasks(self, tasks: List[Dict]) -> pd.DataFrame:
+    def _rows(self, tasks: List[Dict], recording: bool = False) -> Iterator[List]:
+        """Cell values of each task, in _headers order"""
+        for task in tasks:
+            row = [task.get("recording", "")] if recording else []
+            row.extend(task.get(key, default) for _, key, default in TASK_COLUMNS)
+            yield row
+    
+    def format_tasks(self, tasks: List[Dict]) -> "pd.DataFrame":
         """
         Format tasks into a pandas DataFrame
         
+        Only for callers that want a DataFrame; the table and CSV output
+        do not need pandas.
+        
         Args:
             tasks: List of task dictionaries
             
         Returns:
             pandas DataFrame with formatted tasks
         """
-        if not tasks:
-            return pd.DataFrame()
+        with metrics.span("dataframe", tasks=len(tasks)):
+            import pandas as pd
+            
+            if not tasks:
+                return pd.DataFrame()
+            headers = self._headers(tasks)
+            return pd.DataFrame(list(self._rows(tasks, headers[0] == "Recording")), columns=headers)
+    
+    def render_table(self, tasks: List[Dict]) -> str:
+        """
+        Render tasks as the formatted console table
         
-        data = []
-        for task in tasks:
-            data.append({
-                "#": task.get("id", ""),
-                "Task": task.get("task", ""),
-                "Assigned To": task.get("assigned_to", "Unassigned"),
-                "Deadline": task.get("deadline", "Not specified"),
-                "Priority": task.get("priority", "Medium"),
-                "Dependencies": task.get("dependencies", ""),
-                "Reason": task.get("reason", "")
-            })
+        Columns are right-aligned to their widest cell, like pandas prints them;
+        cells longer than MAX_CELL_WIDTH are cut to it.
         
-        df = pd.DataFrame(data)
-        return df
+        Args:
+            tasks: List of task dictionaries
+            
+        Returns:
+            Table text, without a trailing newline
+        """
+        with metrics.span("table", tasks=len(tasks)):
+            if not tasks:
+                return "\nNo tasks identified."
+            
+            headers = self._headers(tasks)
+            rows = [[_cell(value) for value in row] for row in self._rows(tasks, headers[0] == "Recording")]
+            widths = [len(header) for header in headers]
+            for row in rows:
+                for column, cell in enumerate(row):
+                    if len(cell) > widths[column]:
+                        widths[column] = len(cell)
+            
+            lines = [
+                "\n" + "="*120,
+                "IDENTIFIED TASKS WITH DETAILS".center(120),
+                "="*120
+            ]
+            for row in [headers] + rows:
+                lines.append(" " + " ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+            lines.append("="*120)
+            return "\n".join(lines)
     
     def display_table(self, tasks: List[Dict]):
         """
@@ -61,36 +123,63 @@ class OutputFormatter:
         Args:
             tasks: List of task dictionaries
         """
-        df = self.format_tasks(tasks)
-        
-        if df.empty:
-            print("\nNo tasks identified.")
-            return
-        
-        print("\n" + "="*120)
-        print("IDENTIFIED TASKS WITH DETAILS".center(120))
-        print("="*120)
-        
-        pd.set_option('display.max_columns', None)
-        pd.set_option('display.width', None)
-        pd.set_option('display.max_colwidth', 30)
-        
-        print(df.to_string(index=False))
-        print("="*120)
+        print(self.render_table(tasks))
     
     def save_to_csv(self, tasks: List[Dict], output_path: str = "task_assignments.csv"):
         """
         Save tasks to CSV file
         
+        Rows are written as they are formatted, so memory does not grow with
+        the number of tasks.
+        
         Args:
             tasks: List of task dictionaries
             output_path: Path to save CSV file
         """
-        df = self.format_tasks(tasks)
-        df.to_csv(output_path, index=False)
+        with metrics.span("csv", tasks=len(tasks)):
+            headers = self._headers(tasks)
+            with open(output_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow(headers)
+                for row in self._rows(tasks, headers[0] == "Recording"):
+                    writer.writerow([_text(value) for value in row])
         print(f"\nTasks saved to {output_path}")
     
-    def save_to_pdf(self, tasks: List[Dict], output_path: str = None, audio_file: str = None):
+    def save_batch_summary(self, results: List[Dict], output_path: str = "batch_summary.csv"):
+        """
+        Save one row per processed recording to CSV
+        
+        Args:
+            results: Result dictionaries from BatchProcessor.run
+            output_path: Path to save CSV file
+        """
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(BATCH_SUMMARY_COLUMNS)
+            for result in results:
+                wall = result["wall_seconds"]
+                writer.writerow([
+                    result.get("name", result["recording"]),
+                    result["status"],
+                    len(result["tasks"]),
+                    round(result["audio_seconds"], 2),
+                    round(result.get("skipped_seconds", 0.0), 2),
+                    result.get("profile", ""),
+                    round(wall, 2),
+                    round(result["audio_seconds"] / wall, 2) if wall > 0 else 0.0,
+                    _text(result["error"])
+                ])
+        print(f"\nBatch summary saved to {output_path}")
+    
+    def default_pdf_name(self, audio_file: str = None) -> str:
+        """File name used for a PDF report when none is given"""
+        if audio_file:
+            base_name = os.path.splitext(os.path.basename(audio_file))[0]
+            return f"{base_name}_task_assignments.pdf"
+        return f"task_assignments_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    
+    def save_to_pdf(self, tasks: List[Dict], output_path: str = None, audio_file: str = None,
+                    details: Dict[str, str] = None):
         """
         Save tasks to PDF file with professional formatting
         
@@ -98,138 +187,23 @@ class OutputFormatter:
             tasks: List of task dictionaries
             output_path: Path to save PDF file (optional, auto-generated if None)
             audio_file: Original audio file name for reference
+            details: Extra metadata lines, e.g. the Whisper model and decoding profile
+            
+        Returns:
+            Path of the saved PDF, or None when there were no tasks
         """
         if not tasks:
             print("\nNo tasks to save to PDF.")
-            return
+            return None
         
         if output_path is None:
-            if audio_file:
-                base_name = os.path.splitext(os.path.basename(audio_file))[0]
-                output_path = f"{base_name}_task_assignments.pdf"
-            else:
-                output_path = f"task_assignments_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            output_path = self.default_pdf_name(audio_file)
         
         if not output_path.endswith('.pdf'):
             output_path += '.pdf'
         
-        doc = SimpleDocTemplate(
-            output_path, 
-            pagesize=letter,
-            leftMargin=0.5*inch,
-            rightMargin=0.5*inch,
-            topMargin=0.5*inch,
-            bottomMargin=0.5*inch
-        )
-        story = []
-        
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=30,
-            alignment=1 
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=20
-        )
-        
-        title = Paragraph("Meeting Task Assignment Report", title_style)
-        story.append(title)
-        story.append(Spacer(1, 0.2*inch))
-        
-        if audio_file:
-            metadata_text = f"<b>Source Audio:</b> {os.path.basename(audio_file)}<br/>"
-        else:
-            metadata_text = ""
-        metadata_text += f"<b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>"
-        metadata_text += f"<b>Total Tasks:</b> {len(tasks)}"
-        metadata = Paragraph(metadata_text, styles['Normal'])
-        story.append(metadata)
-        story.append(Spacer(1, 0.3*inch))
-        
-        section = Paragraph("Identified Tasks with Details", heading_style)
-        story.append(section)
-        story.append(Spacer(1, 0.1*inch))
-        
-        cell_style = ParagraphStyle(
-            'CellStyle',
-            parent=styles['Normal'],
-            fontSize=9,
-            leading=11,
-            spaceAfter=6,
-            spaceBefore=6
-        )
-        
-        header_style = ParagraphStyle(
-            'HeaderStyle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.whitesmoke,
-            fontName='Helvetica-Bold',
-            leading=13
-        )
-        
-        table_data = []
-        
-        headers = ["#", "Task", "Assigned To", "Deadline", "Priority", "Dependencies", "Reason"]
-        header_row = [Paragraph(self._escape_html(str(h)), header_style) for h in headers]
-        table_data.append(header_row)
-        
-        for task in tasks:
-            row = [
-                Paragraph(self._escape_html(str(task.get("id", ""))), cell_style),
-                Paragraph(self._escape_html(task.get("task", "")), cell_style),
-                Paragraph(self._escape_html(task.get("assigned_to", "Unassigned")), cell_style),
-                Paragraph(self._escape_html(task.get("deadline", "Not specified")), cell_style),
-                Paragraph(self._escape_html(task.get("priority", "Medium")), cell_style),
-                Paragraph(self._escape_html(task.get("dependencies", "") or "-"), cell_style),
-                Paragraph(self._escape_html(task.get("reason", "") or "-"), cell_style)
-            ]
-            table_data.append(row)
-        
-        table = Table(table_data, repeatRows=1, colWidths=[
-            0.35*inch,  
-            2.8*inch,   
-            0.9*inch,   
-            1.0*inch,   
-            0.7*inch,   
-            1.0*inch,   
-            1.15*inch   
-        ])
-        
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ])
-        
-        table.setStyle(table_style)
-        story.append(table)
-        
-        doc.build(story)
+        with metrics.span("pdf", tasks=len(tasks)):
+            from pdf_report import build_report
+            build_report(tasks, output_path, audio_file, details)
         print(f"\n✓ PDF report saved to: {output_path}")
-
+        return output_path
@@ -0,0 +1,264 @@
+"""
+Multi-process transcription with one resident Whisper model per worker
+"""
+import os
+import time
+import multiprocessing
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple
+import numpy as np
+from audio_processor import AudioProcessor, SAMPLE_RATE, decode_audio, decode_options
+from config import DEFAULT_PROFILE
+from vad import speech_regions
+import metrics
+
+
+# Length of the pieces a single long recording is split into
+CHUNK_SECONDS = 600
+
+# A chunk ends in the middle of the pause nearest its nominal end, when one is
+# this close, so no word is cut in two (at most half a chunk either way)
+CHUNK_SEARCH_SECONDS = 30
+
+# torch threads per worker when not given; intra-op threading stops scaling past a few cores
+DEFAULT_THREADS = 4
+
+_processor = None
+
+
+def _init_worker(model_name, threads, cache, pcm_cache, vad, profile, quantize, backend, record_metrics=False):
+    """Create the worker's AudioProcessor; its model stays resident across jobs"""
+    global _processor
+    if record_metrics:
+        metrics.recorder.enable()
+    _processor = AudioProcessor(
+        model_name=model_name, threads=threads, cache=cache, pcm_cache=pcm_cache, vad=vad, profile=profile,
+        quantize=quantize, backend=backend
+    )
+
+
+def _worker_spans() -> List[Dict]:
+    """
+    Spans this worker recorded since the last call, labelled with its process id
+
+    Every job returns them with its result, so the parent records worker
+    stages too; the first job's include loading the model.
+    """
+    spans, metrics.recorder.spans = metrics.recorder.spans, []
+    for span in spans:
+        span["labels"]["worker"] = os.getpid()
+    return spans
+
+
+def _record(spans: List[Dict]):
+    """Add spans sent back by a worker to this process's recorder"""
+    for span in spans:
+        metrics.recorder.record(span)
+
+
+def _transcribe_file(audio_path):
+    start = time.perf_counter()
+    result = _processor.transcribe_file(audio_path)
+    result["transcribe_seconds"] = time.perf_counter() - start
+    return result, _worker_spans()
+
+
+def _transcribe_chunk(audio, offset):
+    return _processor.transcribe_audio(audio, offset), _worker_spans()
+
+
+def _transcribe_cached_chunk(key, start, stop):
+    # The worker maps the cached samples itself, so no audio is pickled across
+    audio = _processor.pcm_cache.get(key)
+    if audio is None:
+        raise RuntimeError("Decoded audio was evicted from the cache during transcription")
+    return _processor.transcribe_audio(audio[start:stop], start / SAMPLE_RATE), _worker_spans()
+
+
+def chunk_bounds(audio: np.ndarray, chunk_size: int,
+                 search: int = CHUNK_SEARCH_SECONDS * SAMPLE_RATE) -> List[Tuple[int, int]]:
+    """
+    Sample ranges of the chunks a recording is transcribed in
+
+    Each cut goes to the middle of the pause between two speech regions
+    (vad.speech_regions) nearest to chunk_size samples after the previous
+    cut. Without a pause within search samples the chunk is cut at
+    chunk_size.
+
+    Args:
+        audio: Mono float32 samples
+        chunk_size: Nominal chunk length in samples
+        search: Farthest a cut moves from its nominal place, in samples
+
+    Returns:
+        Consecutive (start, end) ranges covering the whole recording
+    """
+    search = min(search, chunk_size // 2)
+    pauses = []
+    previous = 0
+    for start, end in speech_regions(audio, SAMPLE_RATE) + [(len(audio), len(audio))]:
+        if start > previous:
+            pauses.append((previous + start) // 2)
+        previous = end
+
+    bounds = []
+    start = 0
+    while start + chunk_size < len(audio):
+        target = start + chunk_size
+        index = bisect_left(pauses, target)
+        near = [pause for pause in pauses[max(index - 1, 0):index + 1] if abs(pause - target) <= search]
+        cut = min(near, key=lambda pause: abs(pause - target)) if near else target
+        bounds.append((start, cut))
+        start = cut
+    bounds.append((start, len(audio)))
+    return bounds
+
+
+class ParallelTranscriber:
+    def __init__(self, model_name="base", workers=None, threads=None, cache=None, pcm_cache=None, vad=True,
+                 profile=DEFAULT_PROFILE, quantize=None, backend="whisper"):
+        """
+        Start a pool of worker processes, each holding its own Whisper model
+
+        Args:
+            model_name: Whisper model size (tiny, base, small, medium, large)
+            workers: Number of worker processes (default: CPU count / threads)
+            threads: torch CPU threads per worker (default: 4, or CPU count / workers)
+            cache: TranscriptCache shared by the workers (optional)
+            pcm_cache: PCMCache shared by the workers (optional)
+            vad: Cut silence out before inference, see AudioProcessor
+            profile: Decoding profile name from DECODE_PROFILES
+            quantize: Weight quantization mode, see AudioProcessor (optional)
+            backend: ASR backend name, see AudioProcessor
+        """
+        cpus = os.cpu_count() or 1
+        if threads is None:
+            threads = max(1, cpus // workers) if workers else min(DEFAULT_THREADS, cpus)
+        if workers is None:
+            workers = max(1, cpus // threads)
+        self.workers = workers
+        self.threads = threads
+        self.model_name = model_name
+        self.cache = cache
+        self.pcm_cache = pcm_cache
+        self.vad = vad
+        self.profile = profile
+        self.quantize = quantize
+        self.backend = backend
+
+        print(f"Starting {workers} transcription workers with {threads} threads each...")
+        # Workers are spawned rather than forked; torch does not survive a fork cleanly
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, threads, cache, pcm_cache, vad, profile, quantize, backend,
+                      metrics.recorder.enabled)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes"""
+        self.executor.shutdown()
+
+    def map_files(self, audio_files: List[str]):
+        """
+        Transcribe recordings across the workers
+
+        Args:
+            audio_files: Paths of the recordings
+
+        Yields:
+            (audio_file, result, error) tuples in input order; result is the
+            AudioProcessor.transcribe_file dictionary plus "transcribe_seconds",
+            or None with the raised exception in error
+        """
+        futures = [self.executor.submit(_transcribe_file, path) for path in audio_files]
+        for audio_file, future in zip(audio_files, futures):
+            try:
+                result, spans = future.result()
+            except Exception as e:
+                yield audio_file, None, e
+            else:
+                _record(spans)
+                yield audio_file, result, None
+
+    def transcribe_chunked(self, audio_path: str, chunk_seconds: int = CHUNK_SECONDS) -> Dict:
+        """
+        Split one recording into chunks and transcribe them across the workers
+
+        Args:
+            audio_path: Path to audio file
+            chunk_seconds: Length of each chunk in seconds
+
+        Returns:
+            Dictionary with "text", "segments", "language" and "duration",
+            segment timestamps relative to the start of the recording
+        """
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        cache_key = None
+        if self.cache is not None:
+            # Chunk boundaries change the transcript, so they are part of the key
+            options = dict(decode_options(self.profile), vad=self.vad, chunk_seconds=chunk_seconds,
+                           chunk_search_seconds=CHUNK_SEARCH_SECONDS)
+            if self.quantize:
+                options["quantize"] = self.quantize
+            if self.backend != "whisper":
+                options["backend"] = self.backend
+            cache_key = self.cache.key(audio_path, self.model_name, options)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"Using cached transcript for {os.path.basename(audio_path)}")
+                return cached
+
+        pcm_key = None
+        if self.pcm_cache is not None:
+            pcm_key = self.pcm_cache.key(audio_path)
+            audio = self.pcm_cache.get(pcm_key)
+            if audio is None:
+                audio = decode_audio(audio_path)
+                self.pcm_cache.put(pcm_key, audio)
+        else:
+            audio = decode_audio(audio_path)
+        bounds = chunk_bounds(audio, chunk_seconds * SAMPLE_RATE)
+        print(f"Transcribing {len(bounds)} chunks of {os.path.basename(audio_path)} "
+              f"across {self.workers} workers...")
+
+        if pcm_key is not None:
+            futures = [
+                self.executor.submit(_transcribe_cached_chunk, pcm_key, start, end)
+                for start, end in bounds
+            ]
+        else:
+            futures = [
+                self.executor.submit(_transcribe_chunk, audio[start:end], start / SAMPLE_RATE)
+                for start, end in bounds
+            ]
+        chunks = []
+        for future in futures:
+            chunk, spans = future.result()
+            _record(spans)
+            chunks.append(chunk)
+
+        text = " ".join(chunk["text"].strip() for chunk in chunks if chunk["text"].strip())
+        if self.vad:
+            print(f"Skipped {sum(chunk['skipped_seconds'] for chunk in chunks):.1f}s of silence")
+        print(f"Transcription completed. Length: {len(text)} characters")
+        result = {
+            "text": text,
+            "segments": [segment for chunk in chunks for segment in chunk["segments"]],
+            "language": chunks[0]["language"] if chunks else None,
+            "duration": len(audio) / SAMPLE_RATE,
+            "skipped_seconds": sum(chunk["skipped_seconds"] for chunk in chunks)
+        }
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+        return result
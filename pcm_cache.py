@@ -0,0 +1,121 @@
+"""
+On-disk cache of decoded audio, memory-mapped so later runs and workers skip ffmpeg
+"""
+import os
+import tempfile
+from typing import Optional
+import numpy as np
+from config import PCM_CACHE_DIR, PCM_CACHE_MAX_MB
+from transcript_cache import file_digest, evict_lru
+
+
+class PCMCache:
+    def __init__(self, directory: str = PCM_CACHE_DIR, max_mb: float = PCM_CACHE_MAX_MB):
+        """
+        Open (and create if needed) a decoded audio cache directory
+
+        Args:
+            directory: Directory holding one .npy file of 16 kHz mono float32 samples per recording
+            max_mb: Size budget; least recently used entries are evicted beyond it
+        """
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, audio_path: str) -> str:
+        """Cache key of a recording: the hash of its bytes, whatever the model"""
+        return file_digest(audio_path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Return the cached samples for key, or None on a miss
+
+        The array is memory-mapped copy-on-write: pages are read from disk
+        on demand and shared between processes mapping the same entry.
+        """
+        path = self._path(key)
+        try:
+            audio = np.load(path, mmap_mode="c")
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return audio
+
+    def put(self, key: str, audio: np.ndarray):
+        """Store decoded samples and evict old entries beyond the size budget"""
+        writer = self.writer(key)
+        writer.write(audio)
+        writer.commit()
+
+    def writer(self, key: str) -> "PCMWriter":
+        """Start an entry that is written window by window, see PCMWriter"""
+        return PCMWriter(self, key)
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits its size budget
+
+        Entries being written count toward the budget; temporary files
+        abandoned by a process that died mid-write are removed (see evict_lru).
+        """
+        evict_lru(self.directory, ".npy", self.max_bytes)
+
+
+class PCMWriter:
+    def __init__(self, cache: PCMCache, key: str):
+        """
+        Write an entry incrementally, so streaming decodes can fill the cache
+
+        Samples go to a temporary file; commit() finalizes the .npy header
+        and moves it into place, so readers never see a partial entry.
+
+        Args:
+            cache: Cache the entry belongs to
+            key: Cache key of the recording
+        """
+        self.cache = cache
+        self.key = key
+        self.samples = 0
+        fd, self.temp_path = tempfile.mkstemp(dir=cache.directory, suffix=".tmp")
+        self.file = os.fdopen(fd, "wb")
+        # The header is rewritten with the real length on commit; numpy pads it
+        # so the length field can grow without moving the data
+        self._write_header()
+
+    def _write_header(self):
+        np.lib.format.write_array_header_1_0(
+            self.file, {"descr": np.dtype(np.float32).str, "fortran_order": False, "shape": (self.samples,)}
+        )
+
+    def write(self, audio: np.ndarray):
+        """Append float32 samples"""
+        self.file.write(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+        self.samples += len(audio)
+
+    def commit(self):
+        """Finish the entry and make it visible to get()"""
+        header_end = self.file.tell() - self.samples * 4
+        self.file.seek(0)
+        self._write_header()
+        if self.file.tell() != header_end:
+            self.discard()
+            raise ValueError("Decoded audio too long for the cache header")
+        self.file.close()
+        try:
+            os.replace(self.temp_path, self.cache._path(self.key))
+        except FileNotFoundError:
+            # Removed as abandoned while the decode was stalled; the audio is just not cached
+            return
+        self.cache.evict()
+
+    def discard(self):
+        """Abandon the entry, e.g. when decoding failed part way"""
+        self.file.close()
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,200 @@
+"""
+PDF task reports with reportlab, laid out one page-sized table at a time
+"""
+import os
+from datetime import datetime
+from typing import List, Dict
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
+from reportlab.platypus import SimpleDocTemplate, Flowable, Table, TableStyle, Paragraph, Spacer
+import metrics
+from output_formatter import TASK_COLUMNS
+
+
+# Task rows per table. Each table is laid out (and split at a page break) on
+# its own, which stays cheap however many tasks the report has
+PDF_TABLE_ROWS = 30
+
+# Task cell font, and the left plus right padding of every cell in points
+CELL_FONT = "Helvetica"
+CELL_FONT_SIZE = 9
+CELL_PADDING = 12
+
+# #, Task, Assigned To, Deadline, Due Date, Priority, Dependencies, Reason, Critical Path
+COLUMN_WIDTHS = [width * inch for width in (0.3, 1.6, 0.85, 0.9, 0.8, 0.65, 0.95, 1.0, 0.85)]
+
+# Styles are built once, on import, and shared by every report
+_styles = getSampleStyleSheet()
+
+NORMAL_STYLE = _styles['Normal']
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_styles['Heading1'],
+    fontSize=20,
+    textColor=colors.HexColor('#1a1a1a'),
+    spaceAfter=30,
+    alignment=1
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_styles['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#2c3e50'),
+    spaceAfter=20
+)
+
+HEADER_STYLE = ParagraphStyle(
+    'HeaderStyle',
+    parent=_styles['Normal'],
+    fontSize=11,
+    textColor=colors.whitesmoke,
+    fontName='Helvetica-Bold',
+    leading=13
+)
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+
+    ('FONTNAME', (0, 1), (-1, -1), CELL_FONT),
+    ('FONTSIZE', (0, 1), (-1, -1), CELL_FONT_SIZE),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+    ('LEFTPADDING', (0, 0), (-1, -1), CELL_PADDING / 2),
+    ('RIGHTPADDING', (0, 0), (-1, -1), CELL_PADDING / 2),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
+
+def escape_html(text) -> str:
+    """Escape HTML special characters for a Paragraph"""
+    if not text:
+        return ""
+    return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _cell(text, width: float) -> str:
+    # A plain string wrapped once here; a Paragraph per cell would be wrapped
+    # again on every layout pass and cost far more than the table itself
+    return "\n".join(simpleSplit(str(text), CELL_FONT, CELL_FONT_SIZE, width - CELL_PADDING))
+
+
+def task_table(tasks: List[Dict]) -> Table:
+    """
+    Table of tasks under the column header row
+
+    Args:
+        tasks: Task dictionaries, at most a page's worth
+
+    Returns:
+        reportlab Table that repeats its header row when split
+    """
+    rows = [[Paragraph(escape_html(header), HEADER_STYLE) for header, _, _ in TASK_COLUMNS]]
+    widths = COLUMN_WIDTHS
+    for task in tasks:
+        rows.append([
+            _cell(task.get("id", ""), widths[0]),
+            _cell(task.get("task", ""), widths[1]),
+            _cell(task.get("assigned_to", "Unassigned"), widths[2]),
+            _cell(task.get("deadline", "Not specified"), widths[3]),
+            _cell(task.get("deadline_date", "") or "-", widths[4]),
+            _cell(task.get("priority", "Medium"), widths[5]),
+            _cell(task.get("dependencies", "") or "-", widths[6]),
+            _cell(task.get("reason", "") or "-", widths[7]),
+            _cell(task.get("critical_path", "") or "-", widths[8])
+        ])
+    table = Table(rows, repeatRows=1, colWidths=COLUMN_WIDTHS)
+    table.setStyle(TABLE_STYLE)
+    return table
+
+
+class LazyTaskTable(Flowable):
+    """
+    Tasks that become a Table only when the page layout reaches them
+
+    The Table is dropped once drawn, so a report holds the layout of one
+    table at a time however many tasks it has.
+    """
+
+    def __init__(self, tasks: List[Dict]):
+        super().__init__()
+        self.tasks = tasks
+        self._table = None
+
+    @property
+    def table(self) -> Table:
+        if self._table is None:
+            self._table = task_table(self.tasks)
+        return self._table
+
+    def wrap(self, availWidth, availHeight):
+        self.width, self.height = self.table.wrap(availWidth, availHeight)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        parts = self.table.split(availWidth, availHeight)
+        if parts:
+            self._table = None
+        return parts
+
+    def draw(self):
+        self.table.drawOn(self.canv, 0, 0)
+        self._table = None
+
+
+def build_report(tasks: List[Dict], output_path: str, audio_file: str = None, details: Dict[str, str] = None):
+    """
+    Write the PDF report
+
+    Args:
+        tasks: Task dictionaries, at least one
+        output_path: Path of the PDF file
+        audio_file: Original audio file name for reference (optional)
+        details: Extra metadata lines, e.g. the Whisper model and decoding profile
+    """
+    doc = SimpleDocTemplate(
+        output_path,
+        pagesize=letter,
+        leftMargin=0.5*inch,
+        rightMargin=0.5*inch,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch
+    )
+    story = []
+
+    story.append(Paragraph("Meeting Task Assignment Report", TITLE_STYLE))
+    story.append(Spacer(1, 0.2*inch))
+
+    if audio_file:
+        metadata_text = f"<b>Source Audio:</b> {escape_html(os.path.basename(audio_file))}<br/>"
+    else:
+        metadata_text = ""
+    for label, value in (details or {}).items():
+        metadata_text += f"<b>{escape_html(label)}:</b> {escape_html(value)}<br/>"
+    metadata_text += f"<b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>"
+    metadata_text += f"<b>Total Tasks:</b> {len(tasks)}"
+    story.append(Paragraph(metadata_text, NORMAL_STYLE))
+    story.append(Spacer(1, 0.3*inch))
+
+    story.append(Paragraph("Identified Tasks with Details", HEADING_STYLE))
+    story.append(Spacer(1, 0.1*inch))
+
+    for start in range(0, len(tasks), PDF_TABLE_ROWS):
+        story.append(LazyTaskTable(tasks[start:start + PDF_TABLE_ROWS]))
+
+    with metrics.span("pdf_build", tasks=len(tasks)):
+        doc.build(story)
@@ -0,0 +1,136 @@
+"""
+Int8 dynamic quantization of Whisper for CPU inference, cached on disk
+"""
+import io
+import os
+import time
+import tempfile
+from dataclasses import asdict
+from typing import Dict
+import torch
+import whisper
+from config import QUANTIZE_MODES, QUANTIZED_MODEL_DIR
+
+
+def quantize_model(model):
+    """
+    Quantize a Whisper model's linear layers to int8 weights, in place
+
+    Activations stay float32 and are quantized on the fly, so no calibration
+    data is needed. Convolutions and embeddings are left as they are.
+
+    Args:
+        model: Whisper model loaded on the CPU
+
+    Returns:
+        The quantized model
+    """
+    # Whisper subclasses nn.Linear only to cast fp16 weights; torch matches
+    # layers to quantize by exact type, so they are turned back into nn.Linear
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def load_quantized(model_name: str, mode: str = "int8", directory: str = QUANTIZED_MODEL_DIR):
+    """
+    Load a quantized Whisper model, converting and caching it on first use
+
+    The cache holds the model dimensions and quantized weights only, read
+    back with weights_only=True: a file in the cache directory is never
+    unpickled as code. The model is rebuilt around them with quantize_model.
+
+    Args:
+        model_name: Whisper model size
+        mode: Quantization mode from QUANTIZE_MODES
+        directory: Directory holding the converted models
+
+    Returns:
+        Quantized Whisper model
+    """
+    if mode not in QUANTIZE_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+
+    path = os.path.join(directory, f"{model_name}-{mode}.state.pt")
+    if os.path.exists(path):
+        checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+        model = quantize_model(whisper.model.Whisper(whisper.model.ModelDimensions(**checkpoint["dims"])))
+        model.load_state_dict(checkpoint["state_dict"])
+        # Not saved with the weights; whisper.load_model sets them the same way
+        alignment_heads = whisper._ALIGNMENT_HEADS.get(model_name)
+        if alignment_heads is not None:
+            model.set_alignment_heads(alignment_heads)
+        return model
+
+    model = quantize_model(whisper.load_model(model_name, device="cpu"))
+    os.makedirs(directory, exist_ok=True)
+    # Several workers may convert at once; each writes its own file and the last replace wins
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        torch.save({"dims": asdict(model.dims), "state_dict": model.state_dict()}, f)
+    os.replace(temp_path, path)
+    return model
+
+
+def model_megabytes(model) -> float:
+    """Size of a model's serialized weights in MB, packed int8 weights included"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Word error rate of a hypothesis transcript against a reference
+
+    Returns:
+        Word-level edit distance divided by the number of reference words
+    """
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref) if ref else float(bool(hyp))
+
+
+def compare_quantized(audio_path: str, model_name: str = "base", mode: str = "int8", **processor_options) -> Dict:
+    """
+    Transcribe a reference recording with full and quantized weights
+
+    Args:
+        audio_path: Reference recording
+        model_name: Whisper model size
+        mode: Quantization mode from QUANTIZE_MODES
+        processor_options: Further AudioProcessor arguments (threads, vad, profile)
+
+    Returns:
+        Dictionary with "full" and "quantized" runs ("seconds", "model_mb", "text"),
+        "speedup", and "wer" of the quantized transcript against the full one
+    """
+    from audio_processor import AudioProcessor
+
+    runs = {}
+    for name, quantize in (("full", None), ("quantized", mode)):
+        processor = AudioProcessor(model_name=model_name, quantize=quantize, **processor_options)
+        audio = processor.load_audio(audio_path)
+        model = processor.model.model
+        start = time.perf_counter()
+        result = processor.transcribe_audio(audio)
+        runs[name] = {
+            "seconds": time.perf_counter() - start,
+            "model_mb": model_megabytes(model),
+            "text": result["text"]
+        }
+
+    full, quantized = runs["full"], runs["quantized"]
+    return {
+        "full": full,
+        "quantized": quantized,
+        "speedup": full["seconds"] / quantized["seconds"] if quantized["seconds"] > 0 else 0.0,
+        "wer": word_error_rate(full["text"], quantized["text"])
+    }
@@ -0,0 +1,175 @@
+"""
+Team roster from config.py or a JSON/YAML file, indexed by name, alias, skill and role
+"""
+import os
+import re
+import json
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from config import TEAM_MEMBERS, ROSTER_FILE, NAME_MATCH_MIN_CONFIDENCE
+from name_index import NameIndex
+
+
+# Words of lowercased text, as names, skills and roles are matched: "UI/UX" is "ui", "ux"
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of text"""
+    return TOKEN.findall(text.lower())
+
+
+class Roster:
+    def __init__(self, members: List[Dict]):
+        """
+        Index team members for lookups that do not scan the whole roster
+
+        Args:
+            members: Member dictionaries with "name", and optionally "role",
+                "skills" and "aliases" (nicknames the name does not sound
+                like), in the config.py TEAM_MEMBERS format. Earlier members
+                win when a lookup matches several.
+        """
+        self.members = []
+        # name or alias token -> members it can refer to
+        self.names: Dict[str, List[Dict]] = {}
+        self.by_name: Dict[str, Dict] = {}
+        # skill as space-joined tokens ("ui bugs") -> members who have it
+        self.skills: Dict[str, List[Dict]] = {}
+        # role token ("qa", "backend", "designer") -> members whose role contains it
+        self.roles: Dict[str, List[Dict]] = {}
+
+        for member in members:
+            if not member.get("name"):
+                raise ValueError(f"Roster entry without a name: {member}")
+            member = {
+                "name": member["name"],
+                "role": member.get("role", ""),
+                "skills": list(member.get("skills", [])),
+                "aliases": list(member.get("aliases", []))
+            }
+            key = member["name"].lower()
+            if key in self.by_name:
+                raise ValueError(f"Duplicate roster name: {member['name']}")
+            self.by_name[key] = member
+            self.members.append(member)
+
+            for token in dict.fromkeys(tokenize(" ".join([member["name"]] + member["aliases"]))):
+                self.names.setdefault(token, []).append(member)
+            for skill in member["skills"]:
+                skill_tokens = tokenize(skill)
+                if not skill_tokens:
+                    continue
+                owners = self.skills.setdefault(" ".join(skill_tokens), [])
+                # "Database" and "database" are one skill
+                if not owners or owners[-1] is not member:
+                    owners.append(member)
+            for token in dict.fromkeys(tokenize(member["role"])):
+                self.roles.setdefault(token, []).append(member)
+
+        self.position = {member["name"]: index for index, member in enumerate(self.members)}
+        # Misheard and misspelled names are found through this, not listed as aliases
+        self.name_index = NameIndex(self.names)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def member(self, name: str) -> Optional[Dict]:
+        """The member with this name, in any case"""
+        return self.by_name.get(name.lower()) if name else None
+
+    def match_name(self, token: str, min_confidence: float = NAME_MATCH_MIN_CONFIDENCE) -> Optional[Tuple[List[Dict], float]]:
+        """
+        The members a token names, exactly or as a misheard or misspelled name
+
+        Args:
+            token: Lowercase word token, see tokenize
+            min_confidence: Ignore fuzzy matches below this confidence
+
+        Returns:
+            (members, confidence) tuple, confidence 1.0 for a name or alias
+            itself; None when the token is not close to any name
+        """
+        match = self.name_index.match(token, min_confidence)
+        if match is None:
+            return None
+        term, confidence = match
+        return self.names[term], confidence
+
+    def mentioned(self, tokens: List[str]) -> Optional[Dict]:
+        """
+        The member named (or aliased) by one of the tokens, earliest in the roster first
+
+        Tokens are matched with match_name, so "moheet" names Mohit. Each
+        distinct token is looked up once, names and aliases by dictionary
+        first, and the search stops at the first member of the roster.
+
+        Args:
+            tokens: Lowercase word tokens, see tokenize
+
+        Returns:
+            Member dictionary, or None when no token is a name
+        """
+        best = None
+        best_position = len(self.members)
+        for token in dict.fromkeys(tokens):
+            members = self.names.get(token)
+            if members is None:
+                match = self.match_name(token)
+                if match is None:
+                    continue
+                members = match[0]
+            for member in members:
+                position = self.position[member["name"]]
+                if position < best_position:
+                    best, best_position = member, position
+            if best_position == 0:
+                break
+        return best
+
+    def with_role(self, role: str) -> Optional[Dict]:
+        """The first member whose role contains the token role, e.g. "qa" or "designer" """
+        members = self.roles.get(role)
+        return members[0] if members else None
+
+
+def load_roster(path: str = None) -> Roster:
+    """
+    Load a roster file, or the default roster
+
+    A file holds a list of members in the TEAM_MEMBERS format, or an object
+    with that list under "members". Files ending in .yaml or .yml need PyYAML;
+    anything else is read as JSON.
+
+    Args:
+        path: Roster file (optional); default_roster() when None
+
+    Returns:
+        Roster
+    """
+    if not path:
+        return default_roster()
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Roster file not found: {path}")
+
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Reading a YAML roster needs PyYAML (pip install pyyaml); "
+                                  "or give the roster as JSON") from None
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    members = data.get("members") if isinstance(data, dict) else data
+    if not isinstance(members, list):
+        raise ValueError(f"Roster file must hold a list of members: {path}")
+    return Roster(members)
+
+
+@lru_cache(maxsize=None)
+def default_roster() -> Roster:
+    """Roster of ROSTER_FILE, or of TEAM_MEMBERS when it is not set, indexed once per process"""
+    return load_roster(ROSTER_FILE) if ROSTER_FILE else Roster(TEAM_MEMBERS)
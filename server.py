@@ -0,0 +1,275 @@
+"""
+Long-running task assignment server that keeps Whisper models loaded between jobs
+"""
+import os
+import json
+import argparse
+import traceback
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from datetime import date
+from typing import Dict, Optional
+from batch_processor import BatchProcessor
+from cli import collect_audio_files, is_batch
+from transcript_cache import TranscriptCache
+from pcm_cache import PCMCache
+from roster import Roster, load_roster
+from deadlines import parse_meeting_date
+import metrics
+from config import SERVER_HOST, SERVER_PORT, DEFAULT_PROFILE
+
+
+class TaskServer:
+    def __init__(self, model_name="base", threads=None, backend="whisper", roster=None):
+        """
+        Load the default model and keep it, the extractor and formatter resident
+
+        Args:
+            model_name: Whisper model loaded at startup
+            threads: torch CPU threads used for inference (optional)
+            backend: ASR backend of the model loaded at startup, see AudioProcessor
+            roster: Roster file used by jobs that do not name one (optional)
+        """
+        self.threads = threads
+        self.roster = load_roster(roster)
+        # (path, modification time) -> Roster, so a job's roster file is parsed once until it changes
+        self.rosters = {}
+        self.processors = {}
+        self.pcm_cache = PCMCache()
+        # Load the model now so the first job does not pay for it
+        self.processor(model_name, backend=backend).audio_processor.model
+
+    def processor(self, model_name: str, cascade: str = None, quantize: str = None,
+                  backend: str = "whisper") -> BatchProcessor:
+        """Return the resident processor for a model (or cascade of two), loading it on first request"""
+        name = f"{model_name}>{cascade}" if cascade else model_name
+        if quantize:
+            name = f"{name}-{quantize}"
+        if backend != "whisper":
+            name = f"{backend}:{name}"
+        if name not in self.processors:
+            self.processors[name] = BatchProcessor(
+                model_name=model_name, threads=self.threads, cascade=cascade, quantize=quantize, backend=backend,
+                roster=self.roster
+            )
+        return self.processors[name]
+
+    def job_roster(self, job: Dict, cwd: str) -> Roster:
+        """The roster file a job names, relative to its cwd, or the server's roster"""
+        if not job.get("roster"):
+            return self.roster
+        path = os.path.join(cwd, job["roster"])
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Roster file not found: {path}")
+        key = (path, os.path.getmtime(path))
+        if key not in self.rosters:
+            self.rosters[key] = load_roster(path)
+        return self.rosters[key]
+
+    def job_meeting_date(self, job: Dict) -> Optional[date]:
+        """The meeting date a job gives, or None to resolve deadlines from today"""
+        return parse_meeting_date(job["meeting_date"]) if job.get("meeting_date") else None
+
+    def handle(self, job: Dict) -> Dict:
+        """
+        Run one job sent by client.py
+
+        Args:
+            job: Parsed main.py arguments plus the client's working directory "cwd";
+                relative paths are resolved against it. With "transcript_text"
+                speech recognition is skipped and a PDF is written only if "pdf" is set
+
+        Returns:
+            For a single recording: "transcript", "tasks", "table", "csv" and "pdf".
+            For a batch: "recordings", one result per file.
+        """
+        cwd = job.get("cwd") or os.getcwd()
+        if job.get("transcript_text") is not None:
+            return self.handle_transcript(job, cwd)
+        
+        inputs = [os.path.join(cwd, item) for item in job["audio_file"]]
+        if job.get("quantize_report"):
+            raise ValueError("--quantize-report is not available through the server; run main.py")
+        # The server runs every job in its own process with its own threads
+        if (job.get("workers") or 1) > 1:
+            raise ValueError("--workers is not available through the server; run main.py")
+        if job.get("threads") is not None and job["threads"] != self.threads:
+            raise ValueError("--threads is set when starting server.py, not per job")
+        batch = self.processor(
+            job.get("model", "base"), job.get("cascade"), job.get("quantize"), job.get("backend") or "whisper"
+        )
+        batch.use_roster(self.job_roster(job, cwd))
+        batch.task_extractor.meeting_date = self.job_meeting_date(job)
+        audio_processor = batch.audio_processor
+        audio_processor.cache = None if job.get("no_cache") else TranscriptCache(refresh=job.get("refresh_cache", False))
+        audio_processor.pcm_cache = None if job.get("no_cache") else self.pcm_cache
+        audio_processor.vad = not job.get("no_vad", False)
+        # An unknown profile raises ValueError before any work is done
+        audio_processor.profile = batch.profile = job.get("profile") or DEFAULT_PROFILE
+
+        if is_batch(inputs):
+            audio_files = collect_audio_files(inputs)
+            if not audio_files:
+                raise FileNotFoundError("No audio files to process")
+            results = batch.run(audio_files, os.path.join(cwd, job.get("output_dir", ".")))
+            return {"recordings": results}
+
+        audio_file = inputs[0]
+        transcription = audio_processor.transcribe_file(audio_file)
+        tasks = batch.task_extractor.extract_tasks(transcription["text"])
+        formatter = batch.formatter
+
+        csv_path = None
+        if job.get("output"):
+            csv_path = os.path.join(cwd, job["output"])
+            formatter.save_to_csv(tasks, csv_path)
+
+        pdf = job.get("pdf")
+        if pdf and pdf != "auto":
+            pdf_path = os.path.join(cwd, pdf)
+        else:
+            pdf_path = os.path.join(cwd, formatter.default_pdf_name(audio_file))
+        pdf_path = formatter.save_to_pdf(tasks, pdf_path, audio_file, batch.details())
+
+        return {
+            "transcript": transcription["text"],
+            "duration": transcription["duration"],
+            "profile": batch.profile,
+            "tasks": tasks,
+            "table": formatter.render_table(tasks),
+            "csv": csv_path,
+            "pdf": pdf_path
+        }
+
+    def handle_transcript(self, job: Dict, cwd: str) -> Dict:
+        """Run a job whose transcript the client already has"""
+        batch = self.processor(job.get("model", "base"), backend=job.get("backend") or "whisper")
+        batch.use_roster(self.job_roster(job, cwd))
+        batch.task_extractor.meeting_date = self.job_meeting_date(job)
+        formatter = batch.formatter
+        transcript = job["transcript_text"]
+        tasks = batch.task_extractor.extract_tasks(transcript)
+
+        csv_path = None
+        if job.get("output"):
+            csv_path = os.path.join(cwd, job["output"])
+            formatter.save_to_csv(tasks, csv_path)
+
+        pdf_path = None
+        pdf = job.get("pdf")
+        if pdf:
+            source = job.get("transcript")
+            source = None if source in (None, "-") else source
+            if pdf == "auto":
+                pdf_path = os.path.join(cwd, formatter.default_pdf_name(source))
+            else:
+                pdf_path = os.path.join(cwd, pdf)
+            pdf_path = formatter.save_to_pdf(tasks, pdf_path, source)
+
+        return {
+            "transcript": transcript,
+            "duration": None,
+            "tasks": tasks,
+            "table": formatter.render_table(tasks),
+            "csv": csv_path,
+            "pdf": pdf_path
+        }
+
+
+class TaskRequestHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP: POST /jobs runs a job, GET /health reports loaded models, GET /metrics stage totals"""
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            data = metrics.recorder.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        self._send_json(200, {"status": "ok", "models": sorted(self.server.task_server.processors)})
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid job: {e}"})
+            return
+
+        # Only this job's spans are kept; the totals behind /metrics keep counting
+        metrics.recorder.clear()
+        try:
+            result = self.server.task_server.handle(job)
+            if job.get("metrics"):
+                result["metrics"] = metrics.recorder.spans
+        except FileNotFoundError as e:
+            self._send_json(404, {"error": str(e)})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            traceback.print_exc()
+            self._send_json(500, {"error": f"Unexpected error: {e}"})
+        else:
+            self._send_json(200, result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep Whisper loaded and serve task assignment jobs to client.py")
+    parser.add_argument("--host", type=str, default=SERVER_HOST, help=f"Address to listen on (default: {SERVER_HOST})")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help=f"Port to listen on (default: {SERVER_PORT})")
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="base",
+        choices=["tiny", "base", "small", "medium", "large"],
+        help="Whisper model loaded at startup; others load on first use (default: base)"
+    )
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU threads (default: torch default)")
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default="whisper",
+        choices=["whisper", "stub"],
+        help="ASR backend loaded at startup; jobs may ask for another (default: whisper)"
+    )
+    parser.add_argument(
+        "--roster",
+        type=str,
+        default=None,
+        help="Team roster file for jobs that do not send --roster (default: ROSTER_FILE or config.py)"
+    )
+    args = parser.parse_args()
+
+    metrics.recorder.enable()
+    task_server = TaskServer(model_name=args.model, threads=args.threads, backend=args.backend, roster=args.roster)
+    # A plain HTTPServer handles one request at a time, so jobs never share a model concurrently
+    httpd = HTTPServer((args.host, args.port), TaskRequestHandler)
+    httpd.task_server = task_server
+    print(f"\n✓ Serving on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        httpd.server_close()
+        for batch in task_server.processors.values():
+            batch.close()
+
+
+if __name__ == "__main__":
+    main()
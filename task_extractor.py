@@ -2,514 +2,674 @@
 Custom task extraction logic from transcribed text
 """
 import re
+from datetime import date
 from typing import List, Dict, Optional
-from config import TEAM_MEMBERS, PRIORITY_KEYWORDS, DEADLINE_PATTERNS
+from config import PRIORITY_KEYWORDS, DEADLINE_PATTERNS
+from roster import Roster, load_roster, tokenize
+from transcript import Transcript, TranscriptBuffer, Span
+from keyword_automaton import KeywordAutomaton, KeywordHits
+from deadlines import resolve_deadline
+from task_graph import TaskIndex, TaskGraph
+import metrics
+
+
+TASK_INDICATORS = [
+    r"need\s+(?:to\s+|someone\s+to\s+)",
+    r"we\s+need\s+(?:to\s+|someone\s+to\s+)",
+    r"should\s+",
+    r"must\s+",
+    r"have\s+to\s+",
+    r"required\s+to\s+",
+    r"someone\s+should\s+",
+    r"tackle\s+",
+    r"update\s+",
+    r"write\s+",
+    r"design\s+",
+    r"fix\s+",
+    r"optimize\s+",
+]
+
+# Where the words naming the task depended on end: the sentence's next clause
+# or the assignment that follows ("after the login fix we need to ...")
+DEPENDENCY_PHRASE_END = [
+    r"[.,;:!?]",
+    r"\bneed\s+(?:to|someone)\b",
+    r"\bshould\b",
+    r"\bmust\b",
+    r"\bhave\s+to\b",
+    r"\brequired\s+to\b",
+]
+
+# Words in the following sentence that mark it as part of the task's context
+CONTEXT_WORDS = ["by", "before", "end", "priority", "depends", "since", "understand"]
+
+TASK_PREFIXES = [
+    r"hi\s+everyone[,\s]+",
+    r"let'?s\s+",
+    r"also[,\s]+",
+    r"and\s+",
+    r"oh\s+and\s+",
+    r"one\s+more\s+thing[,\s]+",
+]
+
+DESCRIPTION_PATTERNS = [
+    r"(?:we\s+)?need\s+(?:to\s+|someone\s+to\s+)(.+?)(?:\.|,|since|that|this|$)",
+    r"should\s+(?:tackle|fix|update|write|design|optimize)\s+(.+?)(?:\.|,|by|before|$)",
+    r"must\s+(.+?)(?:\.|,|$)",
+    r"have\s+to\s+(.+?)(?:\.|,|$)",
+    r"required\s+to\s+(.+?)(?:\.|,|$)",
+    r"someone\s+should\s+(.+?)(?:\.|,|$)",
+    r"tackle\s+(.+?)(?:\.|,|by|before|$)",
+    r"update\s+(.+?)(?:\.|,|by|before|$)",
+    r"write\s+(.+?)(?:\.|,|by|before|$)",
+    r"design\s+(.+?)(?:\.|,|by|before|$)",
+    r"fix\s+(.+?)(?:\.|,|by|before|$)",
+    r"optimize\s+(.+?)(?:\.|,|by|before|$)",
+]
+
+TEST_PATTERNS = [
+    r"write\s+(?:unit\s+)?test",
+    r"write\s+(?:unit\s+)?tests",
+    r"create\s+(?:unit\s+)?test",
+    r"develop\s+(?:unit\s+)?test",
+]
+
+DESIGN_KEYWORDS = [
+    r"design\s+\w+",
+    r"design\s+new",
+    r"design\s+the",
+    r"onboarding\s+screens",
+    r"new\s+onboarding",
+    r"ui\s+design",
+    r"ux\s+design",
+    r"user\s+interface",
+    r"user\s+experience",
+    r"screen\s+design",
+    r"design\s+screens",
+]
+
+# Work-type rules checked against the task sentence, in order, each naming
+# a word of the role (see Roster.with_role) of the member who gets the task
+ASSIGNMENT_RULES = [
+    (TEST_PATTERNS, "qa"),
+    ([r"\bapi\s+documentation\b"], "backend"),
+    ([r"\b(?:update|write|create)\s+.*\s+documentation\b"], "backend"),
+    (DESIGN_KEYWORDS, "designer"),
+    ([r"\b(?:design|onboarding|screens)\b"], "designer"),
+    ([r"\b(?:ui|ux)\b"], "designer"),
+]
+
+TESTING_PHRASES = [
+    r"unit\s+test",
+    r"unit\s+tests",
+    r"write\s+tests",
+    r"test\s+for\s+\w+\s+module",
+    r"test\s+the\s+\w+\s+module",
+    r"qa\s+test",
+    r"quality\s+assurance",
+    r"automation\s+test",
+    r"test\s+module",
+    r"testing\s+task",
+    r"create\s+test",
+    r"develop\s+test",
+]
+
+# Keywords in the task context, in order, and the role word of the member they point to
+ROLE_PATTERNS = {
+    "frontend": "frontend",
+    "backend": "backend",
+    "api documentation": "backend",
+    "api doc": "backend",
+    "documentation": "backend",
+    "ui": "designer",
+    "ux": "designer",
+    "design": "designer",
+    "qa": "qa",
+    "test": "qa",
+    "testing": "qa"
+}
+
+# Context phrases and the assignment reason they add, reported in this order
+REASON_KEYWORDS = [
+    ("blocking", "blocking users"),
+    ("relevant experience", "relevant experience"),
+    ("worked on", "relevant experience"),
+    ("testing task", "testing task"),
+    ("test", "testing task"),
+]
+
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Words before a weekday in a "till/until/by <day>" deadline, in order of precedence
+DAY_PREPOSITIONS = ["till", "until", "by"]
+
+# Plain phrase checks, in order, used when no "till/until/by <day>" is found
+DEADLINE_PHRASES = [
+    ("tomorrow evening", "Tomorrow evening"),
+    ("next monday", "Next Monday"),
+    ("tomorrow", "Tomorrow"),
+    ("end of this week", "End of this week"),
+    ("end of the week", "End of this week"),
+    ("before friday", "Friday"),
+    ("friday", "Friday"),
+    ("wednesday", "Wednesday"),
+    ("monday", "Monday"),
+    ("tuesday", "Tuesday"),
+    ("thursday", "Thursday"),
+    ("saturday", "Saturday"),
+    ("sunday", "Sunday"),
+]
+
+# Characters around a task context searched for an earlier name mention
+CONTEXT_LOOKBEHIND = 400
+CONTEXT_LOOKAHEAD = 100
+
+DEPENDENCY_KEYWORDS = [
+    r"depends?\s+on",
+    r"after\s+",
+    r"following\s+",
+    r"once\s+",
+]
+
+
+class FirstMatch:
+    """
+    An ordered list of patterns compiled once.
+
+    search() reports the first pattern, in list order, that occurs anywhere
+    in the text - the same answer as looping re.search over the raw pattern
+    strings. A combined alternation rejects texts without any hit in a single
+    scan, and since no pattern can occur before that scan's first hit, the
+    per-pattern searches start there.
+    """
+
+    def __init__(self, patterns: List[str], flags: int = 0):
+        patterns = list(patterns)
+        self.patterns = [re.compile(pattern, flags) for pattern in patterns]
+        self.any = _any_of(patterns, flags) if patterns else None
+
+    def search(self, text: str):
+        """
+        Find the first pattern that matches text
+
+        Returns:
+            (index, match) tuple, or (None, None) when nothing matches
+        """
+        if self.any is None:
+            return None, None
+        hit = self.any.search(text)
+        if hit is None:
+            return None, None
+        start = hit.start()
+        for index, pattern in enumerate(self.patterns):
+            match = pattern.search(text, start)
+            if match:
+                return index, match
+        return None, None
+
+
+def _any_of(patterns: List[str], flags: int = 0):
+    """Compile patterns into one alternation for a plain "does any match" test"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
 
 
 class TaskExtractor:
-    def __init__(self):
-        self.team_members = TEAM_MEMBERS
+    def __init__(self, roster: Roster = None, meeting_date: date = None):
+        """
+        Args:
+            roster: Team to assign tasks to (optional, load_roster() default)
+            meeting_date: Date deadlines such as "next Monday" are resolved
+                from (optional, the day of extraction)
+        """
+        self.roster = roster or load_roster()
+        self.meeting_date = meeting_date
+        self.team_members = self.roster.members
         self.priority_keywords = PRIORITY_KEYWORDS
         self.deadline_patterns = DEADLINE_PATTERNS
-    
+        self._compile_rules()
+
+    def _compile_rules(self):
+        """Compile every pattern family once so each context is scanned once per family"""
+        self._task_indicator = _any_of(TASK_INDICATORS)
+        self._context_words = _any_of(re.escape(word) for word in CONTEXT_WORDS)
+
+        self._prefixes = re.compile("".join(f"(?:{prefix})?" for prefix in TASK_PREFIXES), re.IGNORECASE)
+        self._descriptions = FirstMatch(DESCRIPTION_PATTERNS, re.IGNORECASE)
+        self._desc_trailer = re.compile(r"\s+(?:since|that|this|it'?s|which).*$", re.IGNORECASE)
+        self._whitespace = re.compile(r"\s+")
+
+        self._assignment_rules = FirstMatch(
+            ["|".join(f"(?:{p})" for p in patterns) for patterns, _ in ASSIGNMENT_RULES], re.IGNORECASE
+        )
+        self._test_patterns = _any_of(TEST_PATTERNS, re.IGNORECASE)
+        self._testing_phrases = _any_of(TESTING_PHRASES, re.IGNORECASE)
+
+        # All "till/until/by [next] <day>" deadlines in one pattern; these
+        # matches cannot overlap, so one scan finds every one of them
+        self._deadline_days = re.compile(
+            rf"(?P<prep>{'|'.join(DAY_PREPOSITIONS)})\s+(?P<next>next\s+)?(?P<day>{'|'.join(DAYS)})"
+        )
+        self._day_index = {day: index for index, day in enumerate(DAYS)}
+        self._preposition_index = {prep: index for index, prep in enumerate(DAY_PREPOSITIONS)}
+        self._deadline_phrases = FirstMatch([re.escape(phrase) for phrase, _ in DEADLINE_PHRASES])
+        self._deadline_config = FirstMatch(self.deadline_patterns)
+
+        # Priority, role, reason and skill keywords, all found in one pass over a context
+        levels = ["critical", "high", "medium", "low"]
+        self._priority_levels = [level.capitalize() for level in levels]
+        self._role_keywords = list(ROLE_PATTERNS)
+        self._reasons = list(dict.fromkeys(reason for _, reason in REASON_KEYWORDS))
+        self._keywords = KeywordAutomaton()
+        for index, level in enumerate(levels):
+            for keyword in self.priority_keywords[level]:
+                self._keywords.add(keyword.lower(), "priority", index)
+        for index, keyword in enumerate(self._role_keywords):
+            self._keywords.add(keyword, "role", index)
+        self._keywords.add("api", "api")
+        for phrase, reason in REASON_KEYWORDS:
+            self._keywords.add(phrase, "reason", reason)
+        for skill, owners in self.roster.skills.items():
+            self._keywords.add(skill, "skill", owners)
+        self._keywords.build()
+
+        self._dependency = _any_of(DEPENDENCY_KEYWORDS)
+        self._task_number = re.compile(r"task\s*#?(\d+)")
+        self._dependency_phrase_end = _any_of(DEPENDENCY_PHRASE_END)
+
     def extract_tasks(self, text: str) -> List[Dict]:
         """
         Extract tasks from transcribed text
-        
+
         Args:
             text: Transcribed meeting text
-            
+
         Returns:
             List of task dictionaries
         """
-        original_text = text
-        text_lower = text.lower()
-        
-        sentences = re.split(r'[.!?]\s+', text)
-        original_sentences = re.split(r'[.!?]\s+', original_text)
-        
+        with metrics.span("extraction"):
+            return self._extract_tasks(text)
+
+    def _extract_tasks(self, text: str) -> List[Dict]:
+        transcript = Transcript(text)
+        sentences = transcript.sentences
+
         tasks = []
+        index = TaskIndex(clause=self._dependency)
         task_id = 1
-        
-        task_indicators = [
-            r"need\s+(?:to\s+|someone\s+to\s+)",
-            r"we\s+need\s+(?:to\s+|someone\s+to\s+)",
-            r"should\s+",
-            r"must\s+",
-            r"have\s+to\s+",
-            r"required\s+to\s+",
-            r"someone\s+should\s+",
-            r"tackle\s+",
-            r"update\s+",
-            r"write\s+",
-            r"design\s+",
-            r"fix\s+",
-            r"optimize\s+",
-        ]
-        
+
         i = 0
         while i < len(sentences):
-            sentence = sentences[i].strip()
-            original_sentence = original_sentences[i].strip() if i < len(original_sentences) else sentence
-            
-            if not sentence:
+            sentence = sentences[i]
+
+            if not sentence.text:
                 i += 1
                 continue
-            
-            is_task_sentence = any(re.search(indicator, sentence) for indicator in task_indicators)
-            
+
+            is_task_sentence = self._task_indicator.search(sentence.text) is not None
+
             if is_task_sentence:
                 context_parts = []
-                context_original_parts = []
-                
-                if i > 0:
-                    prev_sentence = sentences[i - 1].strip()
-                    prev_original = original_sentences[i - 1].strip() if i - 1 < len(original_sentences) else prev_sentence
-                    if prev_sentence:
-                        context_parts.append(prev_sentence)
-                        context_original_parts.append(prev_original)
-                
+
+                if i > 0 and sentences[i - 1].text:
+                    context_parts.append(sentences[i - 1])
+
                 context_parts.append(sentence)
-                context_original_parts.append(original_sentence)
-                
-                if i + 1 < len(sentences):
-                    next_sentence = sentences[i + 1].strip()
-                    next_original = original_sentences[i + 1].strip() if i + 1 < len(original_sentences) else next_sentence
-                    if any(word in next_sentence for word in ["by", "before", "end", "priority", "depends", "since", "understand"]):
-                        context_parts.append(next_sentence)
-                        context_original_parts.append(next_original)
-                        i += 1  
-                
-                full_context = ". ".join(context_parts)
-                full_context_original = ". ".join(context_original_parts)
-
-                task_desc = self._extract_task_description(full_context, full_context_original)
-                
-                if task_desc:
-                    assignee = self._extract_assignee(full_context, full_context_original, text_lower, original_text)
-                    
-                    deadline = self._extract_deadline(full_context)
-                    
-                    priority = self._extract_priority(full_context)
-                    
-                    dependencies = self._extract_dependencies(full_context, task_id, tasks)
-                    
-                    reason = self._extract_reason(full_context, assignee)
-                    
-                    task = {
-                        "id": task_id,
-                        "task": task_desc,
-                        "assigned_to": assignee or "Unassigned",
-                        "deadline": deadline or "Not specified",
-                        "priority": priority or "Medium",
-                        "dependencies": dependencies or "",
-                        "reason": reason or ""
-                    }
+
+                if i + 1 < len(sentences) and self._context_words.search(sentences[i + 1].text):
+                    context_parts.append(sentences[i + 1])
+                    i += 1
+
+                context = transcript.join(context_parts)
+
+                task = self._extract_task(context, transcript, task_id, tasks, index)
+                if task:
                     tasks.append(task)
+                    index.add(task)
                     task_id += 1
-            
+
             i += 1
-        
+
+        TaskGraph(tasks).annotate()
         return tasks
-    
-    def _extract_task_description(self, sentence: str, original_sentence: str = None) -> Optional[str]:
-        """Extract the task description from a sentence"""
-        if original_sentence is None:
-            original_sentence = sentence
-        
-        prefixes = [
-            r"^(hi\s+everyone[,\s]+)",
-            r"^(let'?s\s+)",
-            r"^(also[,\s]+)",
-            r"^(and\s+)",
-            r"^(oh\s+and\s+)",
-            r"^(one\s+more\s+thing[,\s]+)",
-        ]
-        
-        cleaned = sentence
-        for prefix in prefixes:
-            cleaned = re.sub(prefix, "", cleaned, flags=re.IGNORECASE)
-        
-        patterns = [
-            r"(?:we\s+)?need\s+(?:to\s+|someone\s+to\s+)(.+?)(?:\.|,|since|that|this|$)",
-            r"should\s+(?:tackle|fix|update|write|design|optimize)\s+(.+?)(?:\.|,|by|before|$)",
-            r"must\s+(.+?)(?:\.|,|$)",
-            r"have\s+to\s+(.+?)(?:\.|,|$)",
-            r"required\s+to\s+(.+?)(?:\.|,|$)",
-            r"someone\s+should\s+(.+?)(?:\.|,|$)",
-            r"tackle\s+(.+?)(?:\.|,|by|before|$)",
-            r"update\s+(.+?)(?:\.|,|by|before|$)",
-            r"write\s+(.+?)(?:\.|,|by|before|$)",
-            r"design\s+(.+?)(?:\.|,|by|before|$)",
-            r"fix\s+(.+?)(?:\.|,|by|before|$)",
-            r"optimize\s+(.+?)(?:\.|,|by|before|$)",
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, cleaned, re.IGNORECASE)
-            if match:
-                desc = match.group(1).strip()
-                desc = re.sub(r"\s+(?:since|that|this|it'?s|which).*$", "", desc, flags=re.IGNORECASE)
-                desc = re.sub(r"\s+", " ", desc)
-                if desc:
-                    desc = desc[0].upper() + desc[1:] if len(desc) > 1 else desc.upper()
-                return desc
-        
-        return None
-    
-    def _extract_assignee(self, sentence: str, original_sentence: str = None, full_text: str = None, full_text_original: str = None) -> Optional[str]:
+
+    def _extract_task(self, context: Span, transcript, task_id: int, tasks: List[Dict],
+                      index: TaskIndex = None) -> Optional[Dict]:
         """
-        Extract assignee name from sentence with priority on explicit mentions.
-        Uses custom logic only (regex, pattern matching) - no external APIs or pre-trained models.
+        Build the task dictionary for one task context
+
+        Args:
+            context: Task sentence with its neighbouring context sentences
+            transcript: Transcript (or TranscriptBuffer) the context comes from
+            task_id: Id for the new task
+            tasks: Tasks extracted so far
+            index: TaskIndex of tasks (optional, built from tasks when missing)
+
+        Returns:
+            Task dictionary, or None if the context holds no task description
         """
-        if original_sentence is None:
-            original_sentence = sentence
-        if full_text_original is None:
-            full_text_original = full_text if full_text else sentence
-        
-        sentence_lower = sentence.lower()
-        
-        name_variations = {
-            "Sakshi": ["sakshi", "saksh", "sakshy", "sakshie", "saksh", "sakshy", "sakshie", 
-                      "sakshi", "saksh", "sakshy", "sakshie", "saksh", "sakshy"],
-            "Mohit": ["mohit", "moheet", "moheeth", "mohith", "moeeth", "mohit", "moheet", "mohit"],
-            "Arjun": ["arjun", "arjunn", "arjune", "arjuan", "arjun"],
-            "Lata": ["lata", "latha", "lataa", "lata"]
+        task_desc = self._extract_task_description(context)
+
+        if not task_desc:
+            return None
+
+        keywords = self._extract_keywords(context)
+
+        assignee = self._extract_assignee(context, transcript, keywords)
+
+        deadline = self._extract_deadline(context)
+
+        deadline_date = self._extract_deadline_date(deadline)
+
+        priority = self._extract_priority(context, keywords)
+
+        dependencies = self._extract_dependencies(context, task_id, tasks, index)
+
+        reason = self._extract_reason(context, assignee, keywords)
+
+        return {
+            "id": task_id,
+            "task": task_desc,
+            "assigned_to": assignee or "Unassigned",
+            "deadline": deadline or "Not specified",
+            "deadline_date": deadline_date or "",
+            "priority": priority or "Medium",
+            "dependencies": dependencies or "",
+            "reason": reason or "",
+            # Set once all tasks are known, see TaskGraph.annotate
+            "critical_path": ""
         }
-        
-        for member in self.team_members:
-            name = member["name"]
-            name_lower = name.lower()
-            
-            if name in original_sentence:
+
+    def _extract_task_description(self, context: Span) -> Optional[str]:
+        """Extract the task description from a context"""
+        sentence = context.text
+        cleaned = sentence[self._prefixes.match(sentence).end():]
+
+        index, match = self._descriptions.search(cleaned)
+        if index is None:
+            return None
+
+        desc = match.group(1).strip()
+        desc = self._desc_trailer.sub("", desc)
+        desc = self._whitespace.sub(" ", desc)
+        if desc:
+            desc = desc[0].upper() + desc[1:] if len(desc) > 1 else desc.upper()
+        return desc
+
+    def _extract_keywords(self, context: Span) -> KeywordHits:
+        """Every priority, role, reason and skill keyword in the context, from one scan"""
+        return self._keywords.scan(context.lower)
+
+    def _role_member(self, role: Optional[str]) -> Optional[str]:
+        """Name of the first member whose role contains the word role"""
+        member = self.roster.with_role(role) if role else None
+        return member["name"] if member else None
+
+    def _extract_assignee(self, context: Span, transcript: Transcript = None,
+                          keywords: KeywordHits = None) -> Optional[str]:
+        """
+        Extract assignee name from context with priority on explicit mentions.
+        Uses custom logic only (regex, pattern matching) - no external APIs or pre-trained models.
+        """
+        if keywords is None:
+            keywords = self._extract_keywords(context)
+        context_lower = context.lower
+        tokens = tokenize(context_lower)
+
+        member = self.roster.mentioned(tokens)
+        if member is not None:
+            return member["name"]
+
+        index, _ = self._assignment_rules.search(context_lower)
+        if index is not None:
+            name = self._role_member(ASSIGNMENT_RULES[index][1])
+            if name:
                 return name
-            
-            if name_lower in sentence_lower:
+
+        tester = self._role_member("qa")
+        if transcript is not None:
+            # Names mentioned shortly before the task sentence, then just after it,
+            # whatever ends the sentences ("?", "!", a line break)
+            for window in (transcript.span(context.start - CONTEXT_LOOKBEHIND, context.start),
+                           transcript.span(context.end, context.end + CONTEXT_LOOKAHEAD)):
+                member = self.roster.mentioned(tokenize(window.lower))
+                if member is not None:
+                    return member["name"]
+
+            if tester and transcript.contains(self._test_patterns):
+                return tester
+
+        if tester and self._testing_phrases.search(context_lower):
+            return tester
+
+        # The first role keyword in ROLE_PATTERNS order decides; "ui" is
+        # skipped when the context mentions an API
+        roles = keywords.values("role", whole_words=True)
+        if keywords.get("api", whole_words=True):
+            roles.discard(self._role_keywords.index("ui"))
+        if roles:
+            name = self._role_member(ROLE_PATTERNS[self._role_keywords[min(roles)]])
+            if name:
                 return name
-            
-            if name in name_variations:
-                for variation in name_variations[name]:
-                    pattern = rf"\b{re.escape(variation)}\b"
-                    if re.search(pattern, sentence_lower):
-                        return name
-        
-        for member in self.team_members:
-            name = member["name"]
-            name_lower = name.lower()
-            patterns = [
-                rf"{re.escape(name_lower)}\s*[,]?\s*(?:we\s+need|you'?re|you\s+are|can\s+you)",
-                rf"{re.escape(name_lower)}\s*[,]?\s+(?:please|will\s+you)",
-            ]
-            for pattern in patterns:
-                if re.search(pattern, sentence_lower):
-                    return name
-
-        test_patterns = [
-            r"write\s+(?:unit\s+)?test",
-            r"write\s+(?:unit\s+)?tests",
-            r"create\s+(?:unit\s+)?test",
-            r"develop\s+(?:unit\s+)?test"
-        ]
-        for pattern in test_patterns:
-            if re.search(pattern, sentence_lower, re.IGNORECASE):
-                return "Lata" 
-        
-        if re.search(r"\bapi\s+documentation\b", sentence_lower, re.IGNORECASE):
-            return "Mohit"  
-        
-        if re.search(r"\b(?:update|write|create)\s+.*\s+documentation\b", sentence_lower, re.IGNORECASE):
-            return "Mohit"  
-        
-        else:
-            design_keywords = [
-                r"design\s+\w+",
-                r"design\s+new",
-                r"design\s+the",
-                r"onboarding\s+screens",
-                r"new\s+onboarding",
-                r"ui\s+design",
-                r"ux\s+design",
-                r"user\s+interface",
-                r"user\s+experience",
-                r"screen\s+design",
-                r"design\s+screens"
-            ]
-            for pattern in design_keywords:
-                if re.search(pattern, sentence_lower, re.IGNORECASE):
-                    return "Arjun" 
-            
-            if re.search(r"\b(?:design|onboarding|screens)\b", sentence_lower, re.IGNORECASE):
-                return "Arjun"  
-            
-            ui_ux_match = re.search(r"\b(ui|ux)\b", sentence_lower, re.IGNORECASE)
-            if ui_ux_match:
-                match_pos = ui_ux_match.start()
-                if match_pos >= 3:
-                    before_text = sentence_lower[max(0, match_pos-3):match_pos]
-                    if "api" not in before_text:
-                        return "Arjun"  
-                else:
-                    return "Arjun"  
-        
-        if full_text and full_text_original:
-            full_text_lower = full_text.lower()
-            sentence_lower_clean = sentence_lower.strip()
-
-            sentence_pos = -1
-            first_words = " ".join(sentence_lower_clean.split()[:3])
-            if first_words:
-                sentence_pos = full_text_lower.find(first_words)
-            
-            if sentence_pos >= 0:
-                context_start = max(0, sentence_pos - 400)
-                context_end = min(len(full_text_lower), sentence_pos + len(sentence_lower_clean) + 100)
-                context = full_text_lower[context_start:context_end]
-                context_original = full_text_original[context_start:context_end]
-
-                for member in self.team_members:
-                    name = member["name"]
-                    name_lower = name.lower()
-                    
-                    if name in context_original:
-                        pattern = rf"\b{re.escape(name)}\b"
-                        if re.search(pattern, context_original):
-                            return name
-                    
-                    if name_lower in context:
-                        pattern = rf"\b{re.escape(name_lower)}\b"
-                        if re.search(pattern, context):
-                            return name
-
-                    if name in name_variations:
-                        for variation in name_variations[name]:
-                            pattern = rf"\b{re.escape(variation)}\b"
-                            if re.search(pattern, context):
-                                return name
-        
-
-        context_lower = sentence_lower
-        
-        test_patterns = [
-            r"write\s+(?:unit\s+)?test",
-            r"write\s+(?:unit\s+)?tests",
-            r"create\s+(?:unit\s+)?test",
-            r"develop\s+(?:unit\s+)?test"
-        ]
-        
-        for pattern in test_patterns:
-            if re.search(pattern, context_lower, re.IGNORECASE):
-                return "Lata"  
-
-        if full_text:
-            full_text_lower = full_text.lower()
-            for pattern in test_patterns:
-                if re.search(pattern, full_text_lower, re.IGNORECASE):
-                    return "Lata"  
-        
-        testing_phrases = [
-            r"unit\s+test",
-            r"unit\s+tests",
-            r"write\s+tests",
-            r"test\s+for\s+\w+\s+module",
-            r"test\s+the\s+\w+\s+module",
-            r"qa\s+test",
-            r"quality\s+assurance",
-            r"automation\s+test",
-            r"test\s+module",
-            r"testing\s+task",
-            r"create\s+test",
-            r"develop\s+test"
+
+        # The longest skill mentioned decides
+        skill_matches = [
+            (len(hit.keyword), owner["name"])
+            for hit in keywords.get("skill", whole_words=True) for owner in hit.value
         ]
-        
-        for pattern in testing_phrases:
-            if re.search(pattern, context_lower, re.IGNORECASE):
-                return "Lata" 
-            
-        role_patterns = {
-            "frontend": "Sakshi",
-            "backend": "Mohit",
-            "api documentation": "Mohit",  
-            "api doc": "Mohit",
-            "documentation": "Mohit",  
-            "ui": "Arjun",
-            "ux": "Arjun",
-            "design": "Arjun",
-            "qa": "Lata",
-            "test": "Lata",
-            "testing": "Lata"
-        }
-        
-        if re.search(r"\bapi\s+documentation\b", context_lower, re.IGNORECASE):
-            return "Mohit"  
-        
-        for role_keyword, default_assignee in role_patterns.items():
-            pattern = rf"\b{re.escape(role_keyword)}\b"
-            if re.search(pattern, context_lower, re.IGNORECASE):
-                if role_keyword == "ui" and re.search(r"\bapi\b", context_lower, re.IGNORECASE):
-                    continue
-                return default_assignee
-        
-        skill_matches = []
-        for member in self.team_members:
-            for skill in member["skills"]:
-                skill_lower = skill.lower()
-                pattern = rf"\b{re.escape(skill_lower)}\b"
-                if re.search(pattern, context_lower, re.IGNORECASE):
-                    skill_matches.append((len(skill_lower), member["name"]))  
-        
         if skill_matches:
-            skill_matches.sort(reverse=True)  
-            return skill_matches[0][1]
-        
+            return max(skill_matches)[1]
+
         return None
-    
-    def _extract_deadline(self, sentence: str) -> Optional[str]:
-        """Extract deadline from sentence using custom pattern matching"""
-        sentence_lower = sentence.lower()
-        
-        days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        
-        for day in days:
-            patterns = [
-                rf"till\s+(?:next\s+)?{day}",
-                rf"until\s+(?:next\s+)?{day}",
-                rf"by\s+(?:next\s+)?{day}",
-                rf"till\s+{day}",
-                rf"until\s+{day}",
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, sentence_lower)
-                if match:
-                    matched_text = match.group(0)
-                    parts = matched_text.split()
-                    if "next" in parts:
-                        day_name = parts[-1].capitalize()
-                        return f"Next {day_name}"
-                    else:
-                        return day.capitalize()
-        
-        if "tomorrow evening" in sentence_lower or "by tomorrow evening" in sentence_lower:
-            return "Tomorrow evening"
-        elif "next monday" in sentence_lower:
-            return "Next Monday"
-        elif "tomorrow" in sentence_lower:
-            return "Tomorrow"
-        elif "end of this week" in sentence_lower:
-            return "End of this week"
-        elif "end of the week" in sentence_lower:
-            return "End of this week"
-        elif "before friday" in sentence_lower:
-            return "Friday"
-        elif "friday" in sentence_lower:
-            return "Friday"
-        elif "wednesday" in sentence_lower:
-            return "Wednesday"
-        elif "monday" in sentence_lower:
-            return "Monday"
-        elif "tuesday" in sentence_lower:
-            return "Tuesday"
-        elif "thursday" in sentence_lower:
-            return "Thursday"
-        elif "saturday" in sentence_lower:
-            return "Saturday"
-        elif "sunday" in sentence_lower:
-            return "Sunday"
-        
+
+    def _extract_deadline(self, context: Span) -> Optional[str]:
+        """Extract deadline from context using custom pattern matching"""
+        sentence_lower = context.lower
+
+        # The earliest weekday in DAYS wins, then the preposition, then the earliest mention
+        best = None
+        for match in self._deadline_days.finditer(sentence_lower):
+            rank = (self._day_index[match.group("day")], self._preposition_index[match.group("prep")])
+            if best is None or rank < best[0]:
+                best = (rank, match)
+        if best is not None:
+            match = best[1]
+            day = match.group("day").capitalize()
+            return f"Next {day}" if match.group("next") else day
+
+        index, _ = self._deadline_phrases.search(sentence_lower)
+        if index is not None:
+            return DEADLINE_PHRASES[index][1]
+
         # Try regex patterns from config
-        for pattern in self.deadline_patterns:
-            match = re.search(pattern, sentence_lower)
-            if match:
-                deadline_text = match.group(0)
-                # Capitalize properly
-                if len(deadline_text) > 1:
-                    deadline_text = deadline_text[0].upper() + deadline_text[1:]
-                else:
-                    deadline_text = deadline_text.upper()
-                return deadline_text
-        
+        index, match = self._deadline_config.search(sentence_lower)
+        if index is not None:
+            deadline_text = match.group(0)
+            # Capitalize properly
+            if len(deadline_text) > 1:
+                deadline_text = deadline_text[0].upper() + deadline_text[1:]
+            else:
+                deadline_text = deadline_text.upper()
+            return deadline_text
+
         return None
-    
-    def _extract_priority(self, sentence: str) -> Optional[str]:
-        """Extract priority from sentence"""
-        sentence_lower = sentence.lower()
-        
-        # Check priority keywords in order of importance
-        for priority_level in ["critical", "high", "medium", "low"]:
-            keywords = self.priority_keywords[priority_level]
-            for keyword in keywords:
-                if keyword in sentence_lower:
-                    return priority_level.capitalize()
-        
-        # Default priority based on keywords
-        if "blocking" in sentence_lower or "urgent" in sentence_lower:
-            return "Critical"
-        elif "high priority" in sentence_lower or "important" in sentence_lower:
-            return "High"
-        elif "can wait" in sentence_lower:
-            return "Medium"
-        
+
+    def _extract_deadline_date(self, deadline: Optional[str]) -> Optional[str]:
+        """ISO date of a deadline phrase, counted from the meeting date"""
+        if not deadline:
+            return None
+        resolved = resolve_deadline(deadline, self.meeting_date or date.today())
+        return resolved.isoformat() if resolved else None
+
+    def _extract_priority(self, context: Span, keywords: KeywordHits = None) -> Optional[str]:
+        """Extract priority from context"""
+        if keywords is None:
+            keywords = self._extract_keywords(context)
+        # The most important level with a keyword wins
+        levels = keywords.values("priority")
+        if levels:
+            return self._priority_levels[min(levels)]
+
         return "Medium"  # Default
-    
-    def _extract_dependencies(self, sentence: str, current_task_id: int, existing_tasks: List[Dict] = None) -> Optional[str]:
-        """Extract task dependencies"""
-        if existing_tasks is None:
-            existing_tasks = []
-        
-        sentence_lower = sentence.lower()
-        
-        dependency_keywords = [
-            r"depends?\s+on",
-            r"after\s+",
-            r"following\s+",
-            r"once\s+",
-        ]
-        
-        for keyword in dependency_keywords:
-            if re.search(keyword, sentence_lower):
-                # Try to find task number
-                task_num_match = re.search(r"task\s*#?(\d+)", sentence_lower)
-                if task_num_match:
-                    return f"Depends on Task #{task_num_match.group(1)}"
-                
-                # Try to find task description and match to existing tasks
-                if "login bug" in sentence_lower or "bug fix" in sentence_lower or "login" in sentence_lower:
-                    # Find the login bug task
-                    for task in existing_tasks:
-                        if "login" in task.get("task", "").lower() or "bug" in task.get("task", "").lower():
-                            return f"Depends on Task #{task['id']}"
-                    return "Depends on Task #1"
-                
-                return "Has dependencies"
-        
-        return None
-    
-    def _extract_reason(self, sentence: str, assignee: Optional[str]) -> Optional[str]:
+
+    def _extract_dependencies(self, context: Span, current_task_id: int, existing_tasks: List[Dict] = None,
+                              index: TaskIndex = None) -> Optional[str]:
+        """
+        Extract task dependencies
+
+        "Task #N" is taken as written; otherwise the words after "depends on",
+        "after", "following" or "once" are looked up in the index of the
+        tasks extracted so far.
+
+        Args:
+            context: Task context
+            current_task_id: Id of the task being extracted
+            existing_tasks: Tasks extracted so far, indexed here when index is not given
+            index: TaskIndex of existing_tasks (optional)
+        """
+        sentence_lower = context.lower
+
+        dependency = self._dependency.search(sentence_lower)
+        if dependency is None:
+            return None
+
+        task_num_match = self._task_number.search(sentence_lower)
+        if task_num_match:
+            return f"Depends on Task #{task_num_match.group(1)}"
+
+        if index is None:
+            index = TaskIndex(existing_tasks or [], self._dependency)
+        end = self._dependency_phrase_end.search(sentence_lower, dependency.end())
+        phrase = sentence_lower[dependency.end():end.start() if end else len(sentence_lower)]
+        task_id = index.match(phrase)
+        if task_id is not None and task_id != current_task_id:
+            return f"Depends on Task #{task_id}"
+
+        return "Has dependencies"
+
+    def _extract_reason(self, context: Span, assignee: Optional[str], keywords: KeywordHits = None) -> Optional[str]:
         """Extract reason for assignment"""
+        if keywords is None:
+            keywords = self._extract_keywords(context)
         reasons = []
-        
-        if assignee:
+
+        member = self.roster.member(assignee)
+        if member is not None:
             # Find role-based reasons
-            for member in self.team_members:
-                if member["name"] == assignee:
-                    role = member["role"].lower()
-                    if "frontend" in role:
-                        reasons.append("Frontend task")
-                    elif "backend" in role:
-                        reasons.append("Backend expertise")
-                    elif "design" in role or "ui" in role or "ux" in role:
-                        reasons.append("UI/UX task")
-                    elif "qa" in role or "test" in role:
-                        reasons.append("QA expertise")
-                    break
-        
-        # Check for specific reasons in sentence
-        sentence_lower = sentence.lower()
-        if "blocking" in sentence_lower or "blocking users" in sentence_lower:
-            reasons.append("blocking users")
-        if "relevant experience" in sentence_lower or "worked on" in sentence_lower:
-            reasons.append("relevant experience")
-        if "testing task" in sentence_lower or "test" in sentence_lower:
-            reasons.append("testing task")
-        
+            role = member["role"].lower()
+            if "frontend" in role:
+                reasons.append("Frontend task")
+            elif "backend" in role:
+                reasons.append("Backend expertise")
+            elif "design" in role or "ui" in role or "ux" in role:
+                reasons.append("UI/UX task")
+            elif "qa" in role or "test" in role:
+                reasons.append("QA expertise")
+
+        # Check for specific reasons in context
+        found = keywords.values("reason")
+        reasons += [reason for reason in self._reasons if reason in found]
+
         return ", ".join(reasons) if reasons else None
 
+
+class StreamingTaskExtractor:
+    def __init__(self, extractor: TaskExtractor = None):
+        """
+        Extract tasks from a transcript that arrives in pieces, e.g. live ASR segments
+
+        Only a bounded window of text is kept: the previous sentence plus
+        CONTEXT_LOOKBEHIND characters before the next task context, and
+        enough look-ahead to complete it. A task is emitted as soon as the
+        sentence after it and CONTEXT_LOOKAHEAD further characters have arrived.
+
+        Tasks match TaskExtractor.extract_tasks on the whole text, except that
+        the "a test task was mentioned in this meeting" assignment fallback only
+        knows about the meeting so far.
+
+        Args:
+            extractor: TaskExtractor whose compiled rules are used (optional)
+        """
+        self.extractor = extractor or TaskExtractor()
+        self.buffer = TranscriptBuffer(watch=[self.extractor._test_patterns])
+        self.tasks = []
+        self.index = TaskIndex(clause=self.extractor._dependency)
+        self._previous = None
+
+    def feed(self, text_chunk: str) -> List[Dict]:
+        """
+        Add transcript text
+
+        Args:
+            text_chunk: Next piece of the transcript, in order
+
+        Returns:
+            Tasks whose context became complete with this chunk
+        """
+        self.buffer.append(text_chunk)
+        return self._drain()
+
+    def flush(self) -> List[Dict]:
+        """
+        Mark the end of the transcript
+
+        Fills in the "critical_path" of every task, emitted earlier or not.
+
+        Returns:
+            The remaining tasks
+        """
+        self.buffer.close()
+        new_tasks = self._drain()
+        TaskGraph(self.tasks).annotate()
+        return new_tasks
+
+    def _drain(self) -> List[Dict]:
+        with metrics.span("extraction", streaming=True):
+            return self._drain_tasks()
+
+    def _drain_tasks(self) -> List[Dict]:
+        extractor = self.extractor
+        buffer = self.buffer
+        sentences = buffer.sentences
+        final = buffer.closed
+        new_tasks = []
+
+        while sentences:
+            sentence = sentences[0]
+
+            if not sentence.text or not extractor._task_indicator.search(sentence.text):
+                self._previous = sentences.popleft()
+                continue
+
+            # Whether the next sentence joins the context is unknown until it is complete
+            if len(sentences) < 2 and not final:
+                break
+
+            context_parts = []
+            if self._previous is not None and self._previous.text:
+                context_parts.append(self._previous)
+            context_parts.append(sentence)
+            merge_next = len(sentences) > 1 and extractor._context_words.search(sentences[1].text)
+            if merge_next:
+                context_parts.append(sentences[1])
+            context = buffer.join(context_parts)
+
+            # Names just after the context also count, see _extract_assignee
+            if not final and buffer.end < context.end + CONTEXT_LOOKAHEAD:
+                break
+
+            task = extractor._extract_task(context, buffer, len(self.tasks) + 1, self.tasks, self.index)
+            if task:
+                self.tasks.append(task)
+                self.index.add(task)
+                new_tasks.append(task)
+
+            self._previous = sentences.popleft()
+            if merge_next:
+                self._previous = sentences.popleft()
+
+        # Keep what the next context can reach back to: its previous sentence
+        # and the look-behind window before it
+        first = self._previous or (sentences[0] if sentences else None)
+        keep_from = first.start if first is not None else buffer.end
+        buffer.discard(keep_from - CONTEXT_LOOKBEHIND)
+        return new_tasks
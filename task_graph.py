@@ -0,0 +1,254 @@
+"""
+Task dependencies: an inverted index of task terms, and the dependency graph with its execution order
+"""
+import re
+from typing import List, Dict, Optional, Pattern
+from roster import tokenize
+
+
+# Words too common in task descriptions to tell tasks apart
+STOPWORDS = {
+    "the", "and", "for", "with", "this", "that", "from", "into", "our", "new", "all",
+    "are", "was", "were", "been", "being", "done", "completed", "finished", "first",
+    "task", "work", "can", "will", "should", "need", "needs", "have", "has", "its",
+}
+
+# Shorter words are not indexed ("a", "ui" and "qa" still count through longer ones)
+MIN_TERM_LENGTH = 3
+
+# Words a dependency phrase must share with a task to name it; a phrase with
+# fewer indexed words must share all of them
+MIN_SHARED_TERMS = 2
+
+# Dependency lookups remembered before the oldest are dropped
+MEMO_SIZE = 100000
+
+TASK_REFERENCE = re.compile(r"task\s*#(\d+)", re.IGNORECASE)
+
+
+def task_terms(text: str) -> List[str]:
+    """Distinct indexable words of a task description or dependency phrase"""
+    return [
+        term for term in dict.fromkeys(tokenize(text))
+        if len(term) >= MIN_TERM_LENGTH and term not in STOPWORDS
+    ]
+
+
+class TaskIndex:
+    def __init__(self, tasks: List[Dict] = (), clause: Pattern = None):
+        """
+        Inverted index from description terms to the tasks that contain them
+
+        A dependency phrase is looked up through the posting lists of its own
+        terms, and each lookup picks up where the last one with the same
+        terms stopped, so the cost does not grow with every task extracted.
+
+        Args:
+            tasks: Tasks to index now (optional); later ones are add()ed
+            clause: Pattern, in lowercase, where a description starts naming
+                another task ("after the login fix"); the rest is not indexed (optional)
+        """
+        self.clause = clause
+        # term -> ids of the tasks whose description contains it, in extraction order
+        self.postings: Dict[str, List[int]] = {}
+        self.terms: Dict[int, set] = {}
+        self._searches: Dict[frozenset, list] = {}
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add(self, task: Dict):
+        text = task.get("task", "").lower()
+        if self.clause is not None:
+            found = self.clause.search(text)
+            if found:
+                text = text[:found.start()]
+        terms = task_terms(text)
+        self.terms[task["id"]] = set(terms)
+        for term in terms:
+            self.postings.setdefault(term, []).append(task["id"])
+
+    def match(self, phrase: str) -> Optional[int]:
+        """
+        The task a dependency phrase such as "the login bug fix" refers to
+
+        The earliest task whose description has every indexed term of the
+        phrase; failing that, the most common term is dropped and the rest
+        tried again, as long as MIN_SHARED_TERMS are left. One shared word
+        such as "module" does not make two tasks the same.
+
+        Args:
+            phrase: Text naming the task depended on
+
+        Returns:
+            Task id, or None when no indexed task shares enough terms with phrase
+        """
+        phrase_terms = task_terms(phrase)
+        shared = min(MIN_SHARED_TERMS, len(phrase_terms))
+        terms = sorted(
+            (term for term in phrase_terms if term in self.postings),
+            key=lambda term: len(self.postings[term])
+        )
+        while terms and len(terms) >= shared:
+            task_id = self._first_with_all(terms)
+            if task_id is not None:
+                return task_id
+            terms.pop()
+        return None
+
+    def _first_with_all(self, terms: List[str]) -> Optional[int]:
+        """
+        Earliest task whose description has all terms, rarest term first
+
+        Tasks only get added after the ones already indexed, so a task found
+        stays the answer, and a search that found nothing resumes where it
+        stopped: each posting list is scanned at most once per set of terms.
+        """
+        key = frozenset(terms)
+        # terms -> [task id or None, term whose postings are scanned, postings scanned]
+        search = self._searches.get(key)
+        if search is None:
+            if len(self._searches) >= MEMO_SIZE:
+                self._searches.clear()
+            search = self._searches[key] = [None, terms[0], 0]
+        if search[0] is None:
+            postings = self.postings[search[1]]
+            for position in range(search[2], len(postings)):
+                if key <= self.terms[postings[position]]:
+                    search[0] = postings[position]
+                    break
+            search[2] = len(postings)
+        return search[0]
+
+
+class TaskGraph:
+    def __init__(self, tasks: List[Dict]):
+        """
+        Dependency graph of one meeting's tasks
+
+        Edges come from the "Depends on Task #N" references in each task's
+        "dependencies"; references to tasks that do not exist are ignored.
+
+        Args:
+            tasks: Task dictionaries with unique ids, as extract_tasks returns them
+        """
+        self.tasks = {task["id"]: task for task in tasks}
+        # task id -> ids of the tasks it waits for
+        self.requires: Dict[int, List[int]] = {}
+        for task_id, task in self.tasks.items():
+            dependencies = task.get("dependencies")
+            required = [int(number) for number in TASK_REFERENCE.findall(dependencies)] if dependencies else []
+            self.requires[task_id] = [
+                other for other in dict.fromkeys(required) if other in self.tasks
+            ]
+        self._components = self._strongly_connected()
+
+    def _strongly_connected(self) -> List[List[int]]:
+        """
+        Tarjan's strongly connected components, without recursion
+
+        A component is listed after every component it requires, so the
+        list is a topological order of the graph with its cycles collapsed.
+        """
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack = set()
+        components = []
+
+        for root in self.tasks:
+            if root in index:
+                continue
+            work = [(root, iter(self.requires[root]))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, edges = work[-1]
+                following = next(edges, None)
+                if following is not None:
+                    if following not in index:
+                        index[following] = low[following] = len(index)
+                        stack.append(following)
+                        on_stack.add(following)
+                        work.append((following, iter(self.requires[following])))
+                    elif following in on_stack:
+                        low[node] = min(low[node], index[following])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+        return components
+
+    def cycles(self) -> List[List[int]]:
+        """Groups of tasks that wait for each other, each as sorted task ids"""
+        return [
+            component for component in self._components
+            if len(component) > 1 or component[0] in self.requires[component[0]]
+        ]
+
+    def order(self) -> List[int]:
+        """
+        Task ids in an order they can be done in: every task after the tasks it requires
+
+        Tasks in a cycle cannot all come after each other; they are kept
+        together, by id.
+        """
+        return [task_id for component in self._components for task_id in component]
+
+    def chains(self) -> Dict[int, List[int]]:
+        """
+        The longest chain of required tasks ending at each task, itself included
+
+        Returns:
+            Task id -> ids along the chain, first task to do first; ties go to lower ids
+        """
+        chains: Dict[int, List[int]] = {}
+        cyclic = {task_id for cycle in self.cycles() for task_id in cycle}
+        for task_id in self.order():
+            best: List[int] = []
+            if task_id not in cyclic:
+                for required in self.requires[task_id]:
+                    chain = chains[required]
+                    if len(chain) > len(best) or (len(chain) == len(best) and chain < best):
+                        best = chain
+            chains[task_id] = best + [task_id]
+        return chains
+
+    def critical_path(self) -> List[int]:
+        """The longest chain of tasks that must be done one after another"""
+        longest: List[int] = []
+        for chain in self.chains().values():
+            if len(chain) > len(longest):
+                longest = chain
+        return longest
+
+    def annotate(self):
+        """
+        Set each task's "critical_path": the chain of tasks it waits for, e.g. "#1 -> #3 -> #5"
+
+        Tasks without dependencies get an empty value; tasks in a cycle get
+        the tasks of the cycle, e.g. "Cycle #2, #4".
+        """
+        chains = self.chains()
+        cycle_of = {task_id: cycle for cycle in self.cycles() for task_id in cycle}
+        for task_id, task in self.tasks.items():
+            if task_id in cycle_of:
+                cycle = cycle_of[task_id]
+                task["critical_path"] = "Cycle " + ", ".join(f"#{member}" for member in cycle)
+            elif len(chains[task_id]) > 1:
+                task["critical_path"] = " -> ".join(f"#{member}" for member in chains[task_id])
+            else:
+                task["critical_path"] = ""
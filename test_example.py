@@ -1,8 +1,11 @@
 """
 Test script to verify task extraction with example transcript
 """
-from task_extractor import TaskExtractor
+from datetime import date
+from task_extractor import TaskExtractor, StreamingTaskExtractor
 from output_formatter import OutputFormatter
+from task_graph import TaskGraph
+from roster import default_roster
 
 example_transcript = """Hi everyone, let's discuss this week's priorities.
 Sakshi, we need someone to fix the critical login bug that users reported yesterday. This needs to be done by tomorrow evening since it's blocking users.
@@ -24,6 +27,173 @@ def test_extraction():
     print(f"\nExtracted {len(tasks)} tasks")
     return tasks
 
+def test_streaming_extraction():
+    print("Testing streaming extraction against whole-transcript extraction...")
+    
+    expected = TaskExtractor().extract_tasks(example_transcript)
+    
+    extractor = StreamingTaskExtractor()
+    tasks = []
+    for start in range(0, len(example_transcript), 7):
+        tasks += extractor.feed(example_transcript[start:start + 7])
+    tasks += extractor.flush()
+    
+    assert tasks == expected
+    print(f"Streamed {len(tasks)} tasks, same as whole-transcript extraction")
+    return tasks
+
+def test_stub_backend():
+    print("Testing transcription with the offline stub backend...")
+    
+    import numpy as np
+    from audio_processor import AudioProcessor, SAMPLE_RATE
+    
+    processor = AudioProcessor(backend="stub", vad=False)
+    processor.model.seconds_per_audio_second = 0
+    result = processor.transcribe_audio(np.zeros(50 * SAMPLE_RATE, dtype=np.float32), offset=10.0)
+    
+    starts = [segment["start"] for segment in result["segments"]]
+    assert starts == sorted(starts) and starts[0] == 10.0
+    assert result["text"].strip().startswith("Hi everyone")
+    
+    tasks = TaskExtractor().extract_tasks(result["text"])
+    assert any(task["assigned_to"] == "Sakshi" and "login bug" in task["task"] for task in tasks)
+    
+    # Audio carried over from a segment's start gets its sentence again, even
+    # when all audio is the same silence; the next recording starts over
+    silence = np.zeros(20 * SAMPLE_RATE, dtype=np.float32)
+    first = processor.model.transcribe(silence, offset=100.0)["segments"]
+    carried = processor.model.transcribe(silence, offset=100.0 + first[-1]["start"])["segments"]
+    assert carried[0]["text"] == first[-1]["text"]
+    following = processor.model.transcribe(silence, offset=500.0)["segments"]
+    assert following[0]["text"] != carried[0]["text"]
+    assert processor.transcribe_audio(silence)["text"].strip().startswith("Hi everyone")
+    print(f"Stub transcript of {result['duration']:.0f}s gave {len(tasks)} tasks")
+    return tasks
+
+def test_quantized_cache():
+    print("Testing that a cached quantized model loads back the same...")
+    
+    import importlib.util
+    import tempfile
+    if not (importlib.util.find_spec("torch") and importlib.util.find_spec("whisper")):
+        print("Skipped: torch and openai-whisper are not installed")
+        return None
+    import torch
+    from quantization import load_quantized
+    
+    with tempfile.TemporaryDirectory() as directory:
+        converted = load_quantized("tiny", "int8", directory=directory)
+        reloaded = load_quantized("tiny", "int8", directory=directory)
+    
+    assert list(converted.state_dict()) == list(reloaded.state_dict())
+    mel = torch.randn(1, converted.dims.n_mels, 3000, generator=torch.Generator().manual_seed(0))
+    tokens = torch.tensor([[50258, 50259, 50359]])
+    with torch.no_grad():
+        expected = converted(mel, tokens)
+        logits = reloaded(mel, tokens)
+    assert torch.allclose(expected, logits)
+    print(f"Reloaded {len(reloaded.state_dict())} tensors; logits match")
+    return reloaded
+
+def test_chunk_bounds():
+    print("Testing that long recordings are cut into chunks at pauses...")
+    
+    import numpy as np
+    from parallel_transcriber import chunk_bounds, SAMPLE_RATE
+    
+    # Speech, a 2.5 s pause around the 10 s mark, then speech to the end
+    noise = np.random.default_rng(0).normal(0, 0.1, 30 * SAMPLE_RATE).astype(np.float32)
+    audio = noise.copy()
+    audio[int(8.5 * SAMPLE_RATE):11 * SAMPLE_RATE] = 0
+    bounds = chunk_bounds(audio, 10 * SAMPLE_RATE, search=3 * SAMPLE_RATE)
+    
+    seconds = [(start / SAMPLE_RATE, end / SAMPLE_RATE) for start, end in bounds]
+    assert 8.5 < seconds[0][1] < 11
+    assert all(end == following for (_, end), (following, _) in zip(bounds, bounds[1:]))
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(audio)
+    # No pause near the next nominal cut, so it stays 10 s on
+    assert seconds[1][1] == seconds[0][1] + 10
+    print(f"Chunks: {', '.join(f'{start:.2f}-{end:.2f}s' for start, end in seconds)}")
+    return bounds
+
+def test_misheard_names():
+    print("Testing assignment to misheard roster names...")
+    
+    transcript = """Hi everyone. Moheet, we need to fix the slow reports by Friday.
+Ok. Sakshy, we need to update the landing page before release.
+Good. Latha, we need to review the payment module till next monday."""
+    tasks = TaskExtractor().extract_tasks(transcript)
+    
+    assert [task["assigned_to"] for task in tasks] == ["Mohit", "Sakshi", "Lata"]
+    
+    # Short words a couple of letters from a name are not that name
+    other_words = TaskExtractor().extract_tasks(
+        "Hi everyone. That is a moot point from the MIT folks. Modi says we need to update the pricing page by Friday."
+    )
+    assert [task["assigned_to"] for task in other_words] == ["Unassigned"]
+    assert all(default_roster().match_name(word) is None for word in ("mit", "moot", "modi"))
+    print(f"Misheard names assigned to {', '.join(task['assigned_to'] for task in tasks)}")
+    return tasks
+
+def test_question_separated_assignee():
+    print("Testing assignment across question and exclamation marks...")
+    
+    transcript = """Lata, are you free this week? Great! We need to write the release notes by Friday.
+Mohit, can you look at the server? Sure! Someone should fix the payment timeout bug tomorrow."""
+    tasks = TaskExtractor().extract_tasks(transcript)
+    
+    assert [task["assigned_to"] for task in tasks] == ["Lata", "Mohit"]
+    print(f"Tasks assigned to {', '.join(task['assigned_to'] for task in tasks)}")
+    return tasks
+
+def test_due_dates():
+    print("Testing deadline resolution from the meeting date...")
+    
+    # A Wednesday meeting
+    tasks = TaskExtractor(meeting_date=date(2024, 5, 8)).extract_tasks(example_transcript)
+    
+    due = {task["deadline"]: task["deadline_date"] for task in tasks}
+    assert due == {
+        "Tomorrow evening": "2024-05-09",
+        "End of this week": "2024-05-10",
+        "Friday": "2024-05-10",
+        "Next Monday": "2024-05-13"
+    }
+    print(f"Due dates: {', '.join(f'{deadline} -> {day}' for deadline, day in due.items())}")
+    return tasks
+
+def test_dependency_graph():
+    print("Testing the task dependency graph...")
+    
+    transcript = """Hi everyone. Sakshi, we need to fix the login bug by Friday.
+Ok. Mohit, we need to update the API documentation after the login bug fix.
+Good. Lata, we need to write release notes once the API documentation is updated.
+Fine. Arjun, we need to redesign the settings page after task 5 is done.
+Great. Sakshi, we need to polish the settings icons after task 4 is done.
+Thanks. Once you're free, Lata, we need to update the settings docs."""
+    tasks = TaskExtractor().extract_tasks(transcript)
+    
+    assert [task["critical_path"] for task in tasks] == [
+        "", "#1 -> #2", "#1 -> #2 -> #3", "Cycle #4, #5", "Cycle #4, #5", ""
+    ]
+    # "settings" alone does not name task 4 or 5
+    assert tasks[5]["dependencies"] == "Has dependencies"
+    graph = TaskGraph(tasks)
+    assert graph.cycles() == [[4, 5]]
+    assert graph.order() == [1, 2, 3, 4, 5, 6]
+    assert graph.critical_path() == [1, 2, 3]
+    print(f"Critical path: {tasks[2]['critical_path']}")
+    return tasks
+
 if __name__ == "__main__":
     test_extraction()
+    test_streaming_extraction()
+    test_stub_backend()
+    test_quantized_cache()
+    test_chunk_bounds()
+    test_misheard_names()
+    test_question_separated_assignee()
+    test_due_dates()
+    test_dependency_graph()
 
@@ -0,0 +1,164 @@
+"""
+Transcript split into sentences once and shared by the task extraction helpers
+"""
+import re
+from collections import deque
+from typing import Deque, List, NamedTuple
+
+
+SENTENCE_BREAK = re.compile(r'[.!?]\s+')
+
+# Characters before newly fed text that watched patterns are searched again
+WATCH_OVERLAP = 100
+
+
+class Span(NamedTuple):
+    """A stretch of transcript text with its lowercase form and character offsets"""
+    text: str
+    lower: str
+    start: int
+    end: int
+
+
+class Transcript:
+    def __init__(self, text: str):
+        """
+        Split the meeting text once into sentences
+
+        Args:
+            text: Transcribed meeting text
+        """
+        self.text = text
+        self.lower = text.lower()
+        # str.lower() can change the length of a few non-ASCII characters; offsets
+        # then no longer line up and lowercase slices are made from the original
+        self._aligned = len(self.lower) == len(text)
+        self._found = {}
+
+        self.sentences: List[Span] = []
+        start = 0
+        for match in SENTENCE_BREAK.finditer(text):
+            self.sentences.append(self._stripped(start, match.start()))
+            start = match.end()
+        self.sentences.append(self._stripped(start, len(text)))
+
+    def _stripped(self, start: int, end: int) -> Span:
+        piece = self.text[start:end]
+        stripped = piece.strip()
+        if stripped:
+            start += len(piece) - len(piece.lstrip())
+        end = start + len(stripped)
+        return self.span(start, end)
+
+    def span(self, start: int, end: int) -> Span:
+        """Return the span between two character offsets, clipped to the transcript"""
+        start = max(0, start)
+        end = min(len(self.text), end)
+        text = self.text[start:end]
+        lower = self.lower[start:end] if self._aligned else text.lower()
+        return Span(text, lower, start, end)
+
+    @staticmethod
+    def join(spans: List[Span]) -> Span:
+        """Join consecutive sentence spans into one context, separated by '. '"""
+        return Span(
+            ". ".join(span.text for span in spans),
+            ". ".join(span.lower for span in spans),
+            spans[0].start,
+            spans[-1].end,
+        )
+
+    def contains(self, pattern: re.Pattern) -> bool:
+        """Whether a compiled pattern occurs anywhere in the lowercase text, memoized per pattern"""
+        if pattern not in self._found:
+            self._found[pattern] = pattern.search(self.lower) is not None
+        return self._found[pattern]
+
+
+class TranscriptBuffer:
+    def __init__(self, watch: List[re.Pattern] = ()):
+        """
+        A transcript that arrives in chunks and keeps only a bounded tail in memory
+
+        Offsets are absolute from the start of the stream. span() and contains()
+        behave like Transcript's for the part of the text still held.
+
+        Args:
+            watch: Compiled patterns to look for across everything ever fed,
+                even text already discarded (see contains)
+        """
+        self.text = ""
+        self.lower = ""
+        self.base = 0
+        self.end = 0
+        self.closed = False
+        self._aligned = True
+        # Completed sentences not yet taken by the consumer
+        self.sentences: Deque[Span] = deque()
+        self._sentence_start = 0
+        self._found = {pattern: False for pattern in watch}
+        self._watched_to = 0
+
+    def append(self, chunk: str):
+        """Add text and collect the sentences it completes"""
+        lower = chunk.lower()
+        self._aligned = self._aligned and len(lower) == len(chunk)
+        self.text += chunk
+        self.lower += lower
+        self.end += len(chunk)
+        self._split()
+        self._watch()
+
+    def close(self):
+        """Mark the end of the stream; the unfinished last sentence becomes complete"""
+        self.closed = True
+        self._split()
+        self.sentences.append(self._stripped(self._sentence_start, self.end))
+        self._sentence_start = self.end
+
+    def _split(self):
+        for match in SENTENCE_BREAK.finditer(self.text, self._sentence_start - self.base):
+            # A break touching the end of the buffer may still grow with more whitespace
+            if match.end() == len(self.text) and not self.closed:
+                break
+            self.sentences.append(self._stripped(self._sentence_start, self.base + match.start()))
+            self._sentence_start = self.base + match.end()
+
+    def _watch(self):
+        # Re-search a stretch before the new text so matches spanning chunks are found
+        start = max(self.base, self._watched_to - WATCH_OVERLAP) - self.base
+        for pattern, found in self._found.items():
+            if not found and pattern.search(self.lower, start):
+                self._found[pattern] = True
+        self._watched_to = self.end
+
+    def _stripped(self, start: int, end: int) -> Span:
+        piece = self.text[start - self.base:end - self.base]
+        stripped = piece.strip()
+        if stripped:
+            start += len(piece) - len(piece.lstrip())
+        end = start + len(stripped)
+        return self.span(start, end)
+
+    def span(self, start: int, end: int) -> Span:
+        """Return the span between two absolute offsets, clipped to the text still held"""
+        start = max(self.base, start)
+        end = min(self.end, end)
+        text = self.text[start - self.base:end - self.base]
+        lower = self.lower[start - self.base:end - self.base] if self._aligned else text.lower()
+        return Span(text, lower, start, end)
+
+    join = staticmethod(Transcript.join)
+
+    def discard(self, before: int):
+        """Drop held text before an absolute offset"""
+        before = min(before, self._sentence_start, self._watched_to)
+        if before <= self.base:
+            return
+        self.text = self.text[before - self.base:]
+        self.lower = self.lower[before - self.base:]
+        self.base = before
+
+    def contains(self, pattern: re.Pattern) -> bool:
+        """Whether a watched pattern has occurred anywhere in the stream so far"""
+        return self._found[pattern]
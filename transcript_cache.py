@@ -0,0 +1,149 @@
+"""
+On-disk cache of Whisper transcripts keyed by audio content and model settings
+"""
+import os
+import json
+import hashlib
+import tempfile
+import time
+from typing import Dict, Optional
+from config import TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB
+
+# Temporary files untouched for this long were left by a writer that died
+STALE_TEMP_SECONDS = 600
+
+# Digests of files already hashed in this process, by path, size and mtime
+_digests = {}
+
+
+def file_digest(path: str) -> str:
+    """
+    SHA-256 of a file's bytes, remembered while the file is unchanged
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Audio file not found: {path}")
+
+    stat = os.stat(path)
+    signature = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if signature not in _digests:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        _digests[signature] = digest.hexdigest()
+    return _digests[signature]
+
+
+def evict_lru(directory: str, suffix: str, max_bytes: int):
+    """
+    Remove least recently used cache entries until a directory fits its size budget
+
+    Temporary ".tmp" files still being written count toward the budget;
+    ones not written to for STALE_TEMP_SECONDS were orphaned by a process
+    that died mid-write and are removed.
+
+    Args:
+        directory: Cache directory
+        suffix: File name suffix of the entries
+        max_bytes: Size budget
+    """
+    entries = []
+    writing = 0
+    stale_before = time.time() - STALE_TEMP_SECONDS
+    for name in os.listdir(directory):
+        temporary = name.endswith(".tmp")
+        if not (temporary or name.endswith(suffix)):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+            if temporary and stat.st_mtime < stale_before:
+                os.remove(path)
+                continue
+        except FileNotFoundError:
+            continue
+        if temporary:
+            writing += stat.st_size
+        else:
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = writing + sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+class TranscriptCache:
+    def __init__(self, directory: str = TRANSCRIPT_CACHE_DIR, max_mb: float = TRANSCRIPT_CACHE_MAX_MB, refresh: bool = False):
+        """
+        Open (and create if needed) a transcript cache directory
+
+        Args:
+            directory: Directory holding one JSON file per cached transcript
+            max_mb: Size budget; least recently used entries are evicted beyond it
+            refresh: Ignore existing entries but still store new transcripts
+        """
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.refresh = refresh
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, audio_path: str, model_name: str, options: Dict) -> str:
+        """
+        Build the cache key for a recording
+
+        Args:
+            audio_path: Path to the audio file; its bytes are hashed, not its name
+            model_name: Whisper model size
+            options: Decode options passed to the model
+
+        Returns:
+            Hex digest identifying the transcript
+        """
+        digest = hashlib.sha256(file_digest(audio_path).encode("ascii"))
+        settings = json.dumps({"model": model_name, "options": options}, sort_keys=True)
+        digest.update(settings.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached transcript for key, or None on a miss"""
+        if self.refresh:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return result
+
+    def put(self, key: str, result: Dict):
+        """Store a transcript and evict old entries beyond the size budget"""
+        fields = ("text", "segments", "language", "duration", "skipped_seconds", "redecoded_seconds")
+        entry = {name: result[name] for name in fields if name in result}
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(temp_path, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size budget"""
+        evict_lru(self.directory, ".json", self.max_bytes)
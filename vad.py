@@ -0,0 +1,151 @@
+"""
+Energy and zero-crossing voice activity detection for trimming silence before Whisper
+"""
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+import numpy as np
+
+
+# Analysis frame length
+FRAME_SECONDS = 0.03
+
+# A frame is voiced when its energy is this far above the recording's noise floor
+ENERGY_MARGIN_DB = 12.0
+
+# Frames within this range of the loudest 5% are voiced even when the recording has
+# too little silence for the noise floor estimate to hold
+PEAK_RANGE_DB = 25.0
+
+# Quieter frames still count as (unvoiced) speech when they cross zero this often
+UNVOICED_MARGIN_DB = 6.0
+UNVOICED_ZCR = 0.25
+
+# Frames quieter than this are silence whatever the noise floor
+MIN_ENERGY_DB = -60.0
+
+# Speech kept on both sides of each region so word onsets and endings survive
+SPEECH_PAD_SECONDS = 0.3
+
+# Shorter pauses stay inside a region; shorter bursts are dropped as clicks
+MIN_SILENCE_SECONDS = 1.0
+MIN_SPEECH_SECONDS = 0.25
+
+
+def speech_regions(audio: np.ndarray, sample_rate: int) -> List[Tuple[int, int]]:
+    """
+    Find the stretches of a recording that contain speech
+
+    Args:
+        audio: Mono float32 samples
+        sample_rate: Samples per second
+
+    Returns:
+        Sorted, non-overlapping (start, end) sample ranges
+    """
+    frame = int(sample_rate * FRAME_SECONDS)
+    count = len(audio) // frame
+    if count == 0:
+        return [(0, len(audio))] if len(audio) else []
+
+    frames = audio[:count * frame].reshape(count, frame)
+    power = np.einsum("ij,ij->i", frames, frames) / frame
+    energy = 10 * np.log10(power + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame - 1)
+
+    floor, peak = np.percentile(energy, [10, 95])
+    threshold = max(min(floor + ENERGY_MARGIN_DB, peak - PEAK_RANGE_DB), MIN_ENERGY_DB)
+    voiced = energy > threshold
+    unvoiced = (energy > threshold - UNVOICED_MARGIN_DB) & (zcr > UNVOICED_ZCR)
+    speech = (voiced | unvoiced) & (energy > MIN_ENERGY_DB)
+
+    # Runs of speech frames as [start, end) frame indices
+    edges = np.diff(np.concatenate([[0], speech.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    pad = int(round(SPEECH_PAD_SECONDS / FRAME_SECONDS))
+    min_silence = int(round(MIN_SILENCE_SECONDS / FRAME_SECONDS))
+    min_speech = int(round(MIN_SPEECH_SECONDS / FRAME_SECONDS))
+
+    regions = []
+    for start, end in zip(starts, ends):
+        if end - start < min_speech:
+            continue
+        start = max(0, start - pad)
+        end = min(count, end + pad)
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1][1] = max(regions[-1][1], end)
+        else:
+            regions.append([start, end])
+
+    samples = [(int(start) * frame, int(end) * frame) for start, end in regions]
+    # The partial frame at the end belongs to a region that reaches it
+    if samples and samples[-1][1] == count * frame:
+        samples[-1] = (samples[-1][0], len(audio))
+    return samples
+
+
+class SpeechMap:
+    def __init__(self, regions: List[Tuple[int, int]], sample_rate: int):
+        """
+        Translate times in audio with the silence cut out back to the original recording
+
+        Args:
+            regions: Speech (start, end) sample ranges kept, see speech_regions
+            sample_rate: Samples per second
+        """
+        self.regions = regions
+        self.sample_rate = sample_rate
+        self.trimmed_starts = []
+        total = 0
+        for start, end in regions:
+            self.trimmed_starts.append(total)
+            total += end - start
+        self.trimmed_samples = total
+
+    def silence(self, start: int, end: int) -> int:
+        """Number of samples in the original range [start, end) that were cut out"""
+        kept = sum(max(0, min(end, region_end) - max(start, region_start))
+                   for region_start, region_end in self.regions)
+        return (end - start) - kept
+
+    def original_time(self, seconds: float, end: bool = False) -> float:
+        """
+        Map a time in the trimmed audio to the original timeline
+
+        Args:
+            seconds: Time in the trimmed audio
+            end: The time ends a segment; one falling exactly on a cut stays in
+                the region before it rather than jumping over the silence
+
+        Returns:
+            Time in the original recording, in seconds
+        """
+        if not self.regions:
+            return seconds
+        sample = seconds * self.sample_rate
+        find = bisect_left if end else bisect_right
+        index = max(0, find(self.trimmed_starts, sample) - 1)
+        return (self.regions[index][0] + sample - self.trimmed_starts[index]) / self.sample_rate
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, SpeechMap]:
+    """
+    Cut silence out of a recording
+
+    Args:
+        audio: Mono float32 samples
+        sample_rate: Samples per second
+
+    Returns:
+        (speech, speech_map): the speech regions joined together, and the map
+        from times in it back to the recording. When there is too little
+        silence to be worth cutting, speech is audio itself.
+    """
+    regions = speech_regions(audio, sample_rate)
+    speech_map = SpeechMap(regions, sample_rate)
+    if len(audio) - speech_map.trimmed_samples < MIN_SILENCE_SECONDS * sample_rate:
+        return audio, SpeechMap([(0, len(audio))], sample_rate)
+    speech = np.concatenate([audio[start:end] for start, end in regions]) if regions else audio[:0]
+    return speech, speech_map